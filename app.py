@@ -1,70 +1,331 @@
+import os
+import tempfile
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-from datetime import timedelta
 
 st.set_page_config(page_title="Módulo Vacaciones", layout="wide")
+
+DEFAULT_DATA_PATH = "data/MockData_Vacaciones_Empleados.xlsx"
+DEFAULT_DATA_CACHE_PATH = "data/MockData_Vacaciones_Empleados.parquet"
+DEFAULT_DATA_CACHE_VERSION = 1  # bump whenever _normalize's output changes
+
+DAY_NS = 86_400 * 10**9
+MONDAY_EPOCH_NS = 4 * DAY_NS  # 1970-01-05
+NAT_I8 = np.iinfo(np.int64).min
+DATE_I8_COLUMNS = {"Fecha inicio": "_ini_i8", "Fecha fin": "_fin_i8"}
+XLSX_SIGNATURE = b"PK\x03\x04"       # zip container of .xlsx workbooks
+XLS_SIGNATURE = b"\xd0\xcf\x11\xe0"   # OLE2 container of legacy .xls workbooks
+EXCEL_DTYPES = {"Departamento": "category", "Aprobado": "category"}
+APPROVED_LABEL = "Sí"
+
+CARD_CSS = """
+<style>
+    .cards-row {
+        display: flex;
+        gap: 3rem;
+    }
+    .cards-row .card-container {
+        flex: 1;
+    }
+    .card-container {
+        background-color: #2d2f35;
+        padding: 20px;
+        border-radius: 10px;
+        text-align: center;
+        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3);
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        transition: transform 0.2s;
+    }
+    .card-container:hover {
+        transform: scale(1.02);
+    }
+    .card-title {
+        font-size: 18px;
+        color: #ffffff;
+        margin-bottom: 5px;
+    }
+    .card-value {
+        font-size: 32px;
+        font-weight: bold;
+        color: #ffffff;
+    }
+</style>
+"""
+
+# Frames cached with st.cache_resource are shared across reruns instead of being
+# copied on every hit: callers must treat them as read-only.
+
 # todo: add s3 integration to the data_loader (maybe boto3 or streamlit s3). 
-@st.cache_data
+@st.cache_resource
 def data_loader(uploaded_file=None):
     if uploaded_file is not None:
-        data = pd.read_excel(uploaded_file)
+        data = _normalize(_read_excel(uploaded_file))
     else:
-        data = pd.read_excel("data/MockData_Vacaciones_Empleados.xlsx")
+        data = _load_default_data()
+    
+    # Sidebar options, built once per loaded dataset instead of on every rerun
+    data.attrs["dept_options"] = data["Departamento"].cat.categories.tolist()
+    data.attrs["appr_options"] = data["Aprobado"].cat.categories.tolist()
+    return data
+
+def _file_signature(source):
+    """First four bytes of a path or file-like object, leaving its position unchanged"""
+    if hasattr(source, "read"):
+        position = source.tell()
+        signature = source.read(4)
+        source.seek(position)
+        return signature
+    with open(source, "rb") as f:
+        return f.read(4)
+
+def _read_excel(source):
+    """Workbook as a raw frame, parsed with calamine when it is installed"""
+    if _file_signature(source) not in (XLSX_SIGNATURE, XLS_SIGNATURE):
+        raise ValueError("El archivo no es un libro de Excel válido")
+    
+    try:
+        return pd.read_excel(source, engine="calamine", dtype=EXCEL_DTYPES)
+    except ImportError:
+        return pd.read_excel(source, dtype=EXCEL_DTYPES)
 
+def _normalize(data):
     data["Fecha inicio"] = pd.to_datetime(data["Fecha inicio vacaciones"])
     data["Fecha fin"] = pd.to_datetime(data["Fecha fin vacaciones"])
     data["Departamento"] = data["Departamento"].astype('category')
     data["Aprobado"] = data["Aprobado"].astype('category')
-    data["Días"] = pd.to_numeric(data["Días"], errors='coerce')
+    data["Días"] = pd.to_numeric(data["Días"], errors='coerce', downcast='integer')
+    
+    for column, i8_column in DATE_I8_COLUMNS.items():
+        data[i8_column] = data[column].to_numpy(dtype="datetime64[ns]").view("i8")
 
     return data
-@st.cache_data
-def conflicts_detector(vacation_data):
+
+def _load_default_data():
     """
-    todo: add none approved logic aswell to show ⚠️ and danger for non approved
+    Bundled dataset, read from a Parquet copy of the normalized frame while it
+    matches the workbook's mtime and DEFAULT_DATA_CACHE_VERSION; otherwise parse
+    the xlsx and refresh the copy.
+    """
+    source_mtime = os.stat(DEFAULT_DATA_PATH).st_mtime_ns
+    try:
+        cached = pd.read_parquet(DEFAULT_DATA_CACHE_PATH)
+        if (cached.attrs.get("source_mtime_ns") == source_mtime
+                and cached.attrs.get("cache_version") == DEFAULT_DATA_CACHE_VERSION):
+            return cached
+    except (ImportError, OSError, ValueError):
+        pass
+    
+    data = _normalize(_read_excel(DEFAULT_DATA_PATH))
+    data.attrs["source_mtime_ns"] = source_mtime
+    data.attrs["cache_version"] = DEFAULT_DATA_CACHE_VERSION
+    # Written under a unique temporary name and renamed into place, so
+    # concurrent sessions (threads) and processes never share or read a
+    # half-written copy
+    try:
+        fd, partial_path = tempfile.mkstemp(dir=os.path.dirname(DEFAULT_DATA_CACHE_PATH), suffix=".tmp")
+        os.close(fd)
+    except OSError:
+        return data
+    try:
+        data.to_parquet(partial_path, index=False)
+        os.replace(partial_path, DEFAULT_DATA_CACHE_PATH)
+    except (ImportError, OSError, ValueError, TypeError):
+        # the copy is only a cache; a failed write leaves the data usable
+        try:
+            os.unlink(partial_path)
+        except OSError:
+            pass
+    return data
+
+def _date_i8(data, column):
+    """Date column as int64 nanoseconds (NaT -> NAT_I8), precomputed by data_loader when present"""
+    i8_column = DATE_I8_COLUMNS[column]
+    if i8_column in data.columns:
+        return data[i8_column].to_numpy()
+    return data[column].to_numpy(dtype="datetime64[ns]").view("i8")
+
+def _approved_mask(data):
+    """Rows approved ("Sí"), compared on the categorical codes instead of the strings"""
+    approved = data["Aprobado"]
+    if not isinstance(approved.dtype, pd.CategoricalDtype):
+        return (approved == APPROVED_LABEL).to_numpy()
+    
+    categories = approved.cat.categories
+    if APPROVED_LABEL not in categories:
+        return np.zeros(len(approved), dtype=bool)
+    return approved.cat.codes.to_numpy() == categories.get_loc(APPROVED_LABEL)
+
+def _overlap_pairs(starts, ends):
+    """
+    All (row, other) index pairs whose date intervals overlap, ordered by row.
+    `starts` must be sorted; it acts as the index and each row's candidates are
+    found by binary search, so the cost is O(n log n + k) for k overlaps.
+    """
+    n = len(starts)
+    positions = np.arange(n)
+    
+    # Only later-starting rows that begin before this row ends can overlap it.
+    # Since starts are sorted, once starts[j] > ends[i] no later j overlaps i:
+    # searchsorted finds that break point directly, so the window never scans
+    # past it.
+    window_end = np.searchsorted(starts, ends, side="right")
+    counts = np.clip(window_end - positions - 1, 0, None)
+    
+    rows = np.repeat(positions, counts)
+    window_offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    others = rows + 1 + window_offsets
+    
+    # With well-formed intervals every candidate overlaps; only inverted ones
+    # (end before start) need the second bound checked.
+    if (ends < starts).any():
+        keep = ends[others] >= starts[rows]
+        rows, others = rows[keep], others[keep]
+    
+    pair_rows = np.concatenate([rows, others])
+    pair_others = np.concatenate([others, rows])
+    order = np.lexsort((pair_others, pair_rows))
+    return pair_rows[order], pair_others[order]
+
+def _isin_mask(column, values):
+    """column.isin(values), matched on the categorical codes when possible"""
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        return column.isin(values).to_numpy()
+    
+    wanted_codes = column.cat.categories.get_indexer(values)
+    return np.isin(column.cat.codes.to_numpy(), wanted_codes[wanted_codes >= 0])
+
+def _category_codes(column):
+    """Integer codes in sorted-category order, -1 for missing values"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy()
+    return pd.factorize(column, sort=True)[0]
+
+def _codes_on(column, categories):
+    """Positions of column's values in categories, -1 for missing or unknown"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes = column.cat.codes.to_numpy()
+        mapping = categories.get_indexer(column.cat.categories)
+        return np.where(codes >= 0, mapping[codes], -1)
+    return categories.get_indexer(column)
+
+def _category_sizes(codes, n_categories):
+    """Rows per category code, ignoring -1"""
+    return np.bincount(codes[codes >= 0], minlength=n_categories)
+
+def active_categories(column):
+    """Categories that occur in column, read from its codes instead of its values"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        categories = column.cat.categories
+        return categories[_category_sizes(column.cat.codes.to_numpy(), len(categories)) > 0]
+    return pd.Index(column.dropna().unique())
+
+def _unique_per_category(codes, values, n_categories):
+    """Distinct non-missing values per category code, ignoring -1"""
+    value_codes, uniques = pd.factorize(values)
+    n_values = max(len(uniques), 1)
+    valid = (codes >= 0) & (value_codes >= 0)
+    pairs = np.unique(codes[valid].astype(np.int64) * n_values + value_codes[valid])
+    return np.bincount(pairs // n_values, minlength=n_categories)
+
+def _conflict_pairs(vacation_data):
     """
-    conflicts_details = []
-    approved_vacations = vacation_data[vacation_data["Aprobado"] == "Sí"].copy()
+    Positional (row, other) pairs of approved vacations that overlap within the
+    same department, ordered by department, then by start date of each row.
+    """
+    dept_codes = _category_codes(vacation_data["Departamento"])
+    starts = _date_i8(vacation_data, "Fecha inicio")
+    ends = _date_i8(vacation_data, "Fecha fin")
     
-    if approved_vacations.empty:
-        return conflicts_details
+    candidates = np.flatnonzero(
+        _approved_mask(vacation_data) & (dept_codes >= 0) &
+        (starts != NAT_I8) & (ends != NAT_I8)
+    )
+    # Frames that arrive already ordered by (department, start) skip the sort
+    cand_depts, cand_starts = dept_codes[candidates], starts[candidates]
+    dept_steps = np.diff(cand_depts)
+    if ((dept_steps > 0) | ((dept_steps == 0) & (np.diff(cand_starts) >= 0))).all():
+        order = candidates
+    else:
+        order = candidates[np.lexsort((cand_starts, cand_depts))]
+    dept_bounds = np.flatnonzero(np.diff(dept_codes[order])) + 1
     
-    for dept, dept_data in approved_vacations.groupby("Departamento"):
-        dept_data = dept_data.sort_values("Fecha inicio").reset_index(drop=True)
+    pair_rows, pair_others = [], []
+    for dept_order in np.split(order, dept_bounds):
+        dept_starts, dept_ends = starts[dept_order], ends[dept_order]
+        
+        # Sorted by start, a row can only overlap an earlier one if it starts
+        # before the latest end seen so far; skip departments with no such row.
+        running_max_end = np.maximum.accumulate(dept_ends)
+        if not (dept_starts[1:] <= running_max_end[:-1]).any():
+            continue
         
-        for i, current_employee in dept_data.iterrows():
-            potential_conflicts = dept_data[
-                (dept_data.index != i) &
-                (dept_data["Fecha inicio"] <= current_employee["Fecha fin"]) &
-                (dept_data["Fecha fin"] >= current_employee["Fecha inicio"])
-            ]
-            
-            if not potential_conflicts.empty:
-                conflicts_list = [
-                    {
-                        'conflicting_employee': row["Nombre"],
-                        'conflict_start_date': row["Fecha inicio"],
-                        'conflict_end_date': row["Fecha fin"]
-                    }
-                    for _, row in potential_conflicts.iterrows()
-                ]
-                
-                conflicts_details.append({
-                    'Nombre': current_employee["Nombre"],
-                    'Departamento': current_employee["Departamento"],
-                    'conflictos': conflicts_list,
-                    'tooltip': f"Conflicto con: {', '.join(potential_conflicts['Nombre'].tolist())}"
-                })
-    
-    return conflicts_details
+        rows, others = _overlap_pairs(dept_starts, dept_ends)
+        pair_rows.append(dept_order[rows])
+        pair_others.append(dept_order[others])
+    
+    if not pair_rows:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(pair_rows), np.concatenate(pair_others)
+
+def _conflict_details(vacation_data, rows, others):
+    """One entry per conflicting row, built from the pairs of _conflict_pairs"""
+    if rows.size == 0:
+        return []
+    
+    names = vacation_data["Nombre"].to_numpy()
+    departments = vacation_data["Departamento"].to_numpy()
+    conflict_records = (
+        vacation_data[["Nombre", "Fecha inicio", "Fecha fin"]]
+        .take(others)
+        .rename(columns={
+            'Nombre': 'conflicting_employee',
+            'Fecha inicio': 'conflict_start_date',
+            'Fecha fin': 'conflict_end_date'
+        })
+        .to_dict('records')
+    )
+    
+    bounds = np.flatnonzero(np.diff(rows)) + 1
+    return [
+        {
+            'Nombre': names[rows[lo]],
+            'Departamento': departments[rows[lo]],
+            'conflictos': conflict_records[lo:hi],
+            'tooltip': f"Conflicto con: {', '.join(names[others[lo:hi]])}"
+        }
+        for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, rows.size])
+    ]
 
 @st.cache_data
+def conflicts_detector(vacation_data):
+    """
+    todo: add none approved logic aswell to show ⚠️ and danger for non approved
+    """
+    return _conflict_details(vacation_data, *_conflict_pairs(vacation_data))
+
+@st.cache_resource
+def conflict_graph(data):
+    """Conflict pairs of the whole dataset, built once per loaded file"""
+    return _conflict_pairs(data)
+
+def visible_conflicts(data, filtered_data):
+    """
+    Same result as conflicts_detector(filtered_data), taken from the cached
+    conflict graph of `data` by keeping the pairs whose rows are both visible.
+    """
+    rows, others = conflict_graph(data)
+    visible = data.index.isin(filtered_data.index)
+    keep = visible[rows] & visible[others]
+    return _conflict_details(data, rows[keep], others[keep])
+
+@st.cache_resource
 def table_formatter(vacation_data, conflicts_details):
     if vacation_data.empty:
         return pd.DataFrame() 
     
-    display_data = vacation_data.drop_duplicates(subset=['Nombre', 'Fecha inicio', 'Fecha fin']).copy()
+    display_data = vacation_data.drop_duplicates(subset=['Nombre', 'Fecha inicio', 'Fecha fin'])
     
     column_mapping = {
         'Nombre': 'Empleado',
@@ -75,98 +336,188 @@ def table_formatter(vacation_data, conflicts_details):
         'Aprobado': 'Estado'
     }
     
+    # Dates stay datetime64; the DateColumn config in render_table_view formats them
     display_data = display_data[list(column_mapping.keys())].rename(columns=column_mapping)
     
-    display_data['Inicio de Vacaciones'] = display_data['Inicio de Vacaciones'].dt.strftime('%Y-%m-%d')
-    display_data['Fin de Vacaciones'] = display_data['Fin de Vacaciones'].dt.strftime('%Y-%m-%d')
-    
     conflicts_dict = {c['Nombre']: '⚠️' for c in conflicts_details}
     display_data.insert(0, '⚠️', display_data['Empleado'].map(conflicts_dict).fillna(''))
     
     return display_data
 
-@st.cache_data
+@st.cache_resource
 def employees_vacations_per_week(vacation_data):
     if vacation_data.empty:
         return pd.DataFrame()
     
-    start_date = vacation_data["Fecha inicio"].min()
-    end_date = vacation_data["Fecha fin"].max()
-    
+    all_starts = _date_i8(vacation_data, "Fecha inicio")
+    all_ends = _date_i8(vacation_data, "Fecha fin")
+    known_starts = all_starts[all_starts != NAT_I8]
+    known_ends = all_ends[all_ends != NAT_I8]
+    if known_starts.size == 0 or known_ends.size == 0:
+        return pd.DataFrame()
     
-    week_starts = pd.date_range(
-        start=start_date - timedelta(days=start_date.weekday()),
-        end=end_date,
-        freq='W-MON'
+    # Weeks run from the Monday of the earliest start, stepping 7 days in int64
+    start_i8 = known_starts.min()
+    first_week = start_i8 - (start_i8 - MONDAY_EPOCH_NS) // DAY_NS % 7 * DAY_NS
+    n_weeks = (known_ends.max() - first_week) // (7 * DAY_NS) + 1
+    if n_weeks <= 0:
+        return pd.DataFrame()
+    week_begins = first_week + 7 * DAY_NS * np.arange(n_weeks, dtype=np.int64)
+    
+    dated = (all_starts != NAT_I8) & (all_ends != NAT_I8)
+    starts, ends = all_starts[dated], all_ends[dated]
+    
+    # A row is on vacation in week w while start <= week_end(w) and
+    # end >= week_begin(w): that is a contiguous run of weeks [first, last],
+    # added to a difference array and accumulated once.
+    week_ns = 7 * DAY_NS
+    first = np.maximum(-((first_week + 6 * DAY_NS - starts) // week_ns), 0)
+    last = np.minimum((ends - first_week) // week_ns, n_weeks - 1)
+    spans = first <= last
+    delta = (
+        np.bincount(first[spans], minlength=n_weeks + 1) -
+        np.bincount(last[spans] + 1, minlength=n_weeks + 1)
     )
+    active = np.cumsum(delta[:-1])
     
-    weekly_results = []
-    for week_start in week_starts:
-        week_end = week_start + timedelta(days=6)
-        
-        
-        employees_on_vacation = vacation_data[
-            (vacation_data["Fecha inicio"] <= week_end) & 
-            (vacation_data["Fecha fin"] >= week_start)
-        ]
-        
-        weekly_results.append({
-            'week_label': f"Semana {week_start.strftime('%Y-%m-%d')}",
-            'week_start': week_start,
-            'empleados_vacaciones': len(employees_on_vacation),
-            'empleados_detalles': employees_on_vacation[['Nombre', 'Departamento']].to_dict('records')
-        })
+    week_starts = pd.DatetimeIndex(week_begins.view("datetime64[ns]"))
+    return pd.DataFrame({
+        'week_label': week_starts.strftime('Semana %Y-%m-%d'),
+        'week_start': week_starts,
+        'empleados_vacaciones': active
+    })
+
+@st.cache_data
+def week_vacation_details(vacation_data, week_start):
+    """Employees on vacation during the week starting at `week_start`"""
+    week_begin = pd.Timestamp(week_start).value
+    week_end = week_begin + 6 * DAY_NS
+    starts = _date_i8(vacation_data, "Fecha inicio")
+    mask = (
+        (starts != NAT_I8) & (starts <= week_end) &
+        (_date_i8(vacation_data, "Fecha fin") >= week_begin)
+    )
     
-    return pd.DataFrame(weekly_results)
+    return vacation_data.iloc[np.flatnonzero(mask)][['Nombre', 'Departamento']]
 
 @st.cache_data
 def department_percentages(total_data, current_vacation_data):
     
-    total_by_dept = total_data.groupby('Departamento', observed=True)['Nombre'].nunique()
+    departments = total_data['Departamento'].astype('category').cat.categories
+    total_by_dept = _unique_per_category(
+        _codes_on(total_data['Departamento'], departments), total_data['Nombre'], len(departments)
+    )
     
     if current_vacation_data.empty:
-        vacation_by_dept = pd.Series(dtype='int64', name='empleados_vacaciones')
-        vacation_by_dept.index.name = 'Departamento'
+        vacation_by_dept = np.zeros(len(departments), dtype='int64')
     else:
-        vacation_by_dept = current_vacation_data.groupby('Departamento', observed=True)['Nombre'].nunique()
-    
+        vacation_by_dept = _unique_per_category(
+            _codes_on(current_vacation_data['Departamento'], departments),
+            current_vacation_data['Nombre'],
+            len(departments)
+        )
     
-    merged_data = pd.DataFrame({
-        'total_empleados': total_by_dept,
-        'empleados_vacaciones': vacation_by_dept
+    # Both counts share the category axis, so no index alignment is needed
+    present = total_by_dept > 0
+    return pd.DataFrame({
+        'Departamento': departments[present].astype(str),
+        'total_empleados': total_by_dept[present].astype('int64'),
+        'empleados_vacaciones': vacation_by_dept[present].astype('int64'),
+        'porcentaje_vacaciones': vacation_by_dept[present] / total_by_dept[present] * 100
     })
-    
-    merged_data['empleados_vacaciones'] = merged_data['empleados_vacaciones'].fillna(0).astype('int64')
-    
-    merged_data['porcentaje_vacaciones'] = (
-        merged_data['empleados_vacaciones'] / merged_data['total_empleados'] * 100
+
+# Figures are cached with st.cache_resource and shared across reruns: callers
+# must not mutate them.
+@st.cache_resource
+def gantt_chart(filtered_data):
+    """Gantt timeline of the filtered vacations"""
+    gantt_data = filtered_data[['Nombre', 'Fecha inicio', 'Fecha fin', 'Departamento']].rename(
+        columns={'Nombre': 'Empleado'}
     )
     
-    result = merged_data.reset_index()
-    if result['Departamento'].dtype.name == 'category':
-        result['Departamento'] = result['Departamento'].astype(str)
-    
-    return result
+    fig = px.timeline(
+        gantt_data,
+        x_start="Fecha inicio",
+        x_end="Fecha fin",
+        y="Empleado",
+        color="Departamento"
+    )
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+@st.cache_resource
+def weekly_chart(weekly_data):
+    """Line plot of employees on vacation per week"""
+    fig = px.line(
+        weekly_data, 
+        x='week_start', 
+        y='empleados_vacaciones',
+        title='Número de Empleados en Vacaciones por Semana',
+        labels={'empleados_vacaciones': 'Empleados en Vacaciones', 'week_start': 'Semana'}
+    )
+    fig.update_traces(mode='lines+markers')
+    return fig
+
+@st.cache_resource
+def department_totals_chart(data):
+    """Bar chart of vacation records per department"""
+    departments = data["Departamento"].astype('category').cat.categories
+    sizes = _category_sizes(_codes_on(data["Departamento"], departments), len(departments))
+    present = sizes > 0
+    dept_distribution = pd.DataFrame({"Departamento": departments[present], "Cantidad": sizes[present]})
+    return px.bar(
+        dept_distribution, 
+        x="Departamento", 
+        y="Cantidad", 
+        title="Total de Registros de Vacaciones por Departamento"
+    )
+
+@st.cache_resource
+def department_percentage_chart(department_stats):
+    """Bar chart of the share of each department currently on vacation"""
+    return px.bar(
+        department_stats,
+        x='Departamento',
+        y='porcentaje_vacaciones',
+        title='Porcentaje de Empleados en Vacaciones por Departamento',
+        labels={'porcentaje_vacaciones': 'Porcentaje en Vacaciones (%)'},
+        color='porcentaje_vacaciones',
+        color_continuous_scale='Blues'
+    )
+
+@st.cache_resource
+def current_vacations_chart(current_vacations):
+    """Donut chart of current vacations per department"""
+    departments = current_vacations['Departamento'].astype('category').cat.categories
+    sizes = _category_sizes(_codes_on(current_vacations['Departamento'], departments), len(departments))
+    present = sizes > 0
+    vacation_distribution = pd.DataFrame({'Departamento': departments[present], 'count': sizes[present]})
+    fig = px.pie(
+        vacation_distribution,
+        values='count',
+        names='Departamento',
+        title='Distribución de Empleados Actualmente en Vacaciones'
+    )
+    fig.update_traces(hole=0.4)
+    return fig
 
 def get_filtered_data(data, departments, approval_status, date_range):
     """Efficient filtering with early returns"""
     if data.empty:
         return data
     
-    filtered_data = data[
-        data["Departamento"].isin(departments) &
-        data["Aprobado"].isin(approval_status)
-    ]
+    mask = (
+        _isin_mask(data["Departamento"], departments) &
+        _isin_mask(data["Aprobado"], approval_status)
+    )
     
     if len(date_range) == 2:
-        start_date = pd.to_datetime(date_range[0])
-        end_date = pd.to_datetime(date_range[1])
-        filtered_data = filtered_data[
-            (filtered_data["Fecha inicio"] >= start_date) &
-            (filtered_data["Fecha fin"] <= end_date)
-        ]
+        start_i8 = pd.to_datetime(date_range[0]).value
+        end_i8 = pd.to_datetime(date_range[1]).value
+        ends = _date_i8(data, "Fecha fin")
+        mask &= (_date_i8(data, "Fecha inicio") >= start_i8) & (ends <= end_i8) & (ends != NAT_I8)
     
-    return filtered_data
+    return data.iloc[np.flatnonzero(mask)]
 
 @st.cache_data
 def get_current_vacations(filtered_data, _today=None):
@@ -174,11 +525,15 @@ def get_current_vacations(filtered_data, _today=None):
     if _today is None:
         _today = pd.Timestamp.now()
     
-    return filtered_data[
-        (filtered_data["Fecha inicio"] <= _today) & 
-        (filtered_data["Fecha fin"] >= _today) &
-        (filtered_data["Aprobado"] == "Sí")
-    ]
+    today_i8 = pd.Timestamp(_today).value
+    starts = _date_i8(filtered_data, "Fecha inicio")
+    mask = (
+        (starts != NAT_I8) & (starts <= today_i8) &
+        (_date_i8(filtered_data, "Fecha fin") >= today_i8) &
+        _approved_mask(filtered_data)
+    )
+    
+    return filtered_data.iloc[np.flatnonzero(mask)]
 
 def calculate_summary_metrics(filtered_data):
     
@@ -186,46 +541,17 @@ def calculate_summary_metrics(filtered_data):
         return 0, 0.0, 0.0
     
     total_employees = len(filtered_data)
-    avg_days = filtered_data["Días"].mean()
-    approved_count = (filtered_data["Aprobado"] == "Sí").sum()
+    days = filtered_data["Días"].to_numpy(dtype="float64", na_value=np.nan)
+    known_days = days[~np.isnan(days)]
+    avg_days = known_days.mean() if known_days.size else np.nan
+    approved_count = np.count_nonzero(_approved_mask(filtered_data))
     approved_percentage = (approved_count / total_employees) * 100
     
     return total_employees, avg_days, approved_percentage
 
 def render_summary_cards(total_emp, avg_days, approved_pct, current_vacations_count):
     
-    """Render summary cards with cached CSS"""
-    # if 'card_css_loaded' not in st.session_state:
-    st.markdown("""
-        <style>
-            .card-container {
-                background-color: #2d2f35;
-                padding: 20px;
-                border-radius: 10px;
-                text-align: center;
-                box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3);
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                transition: transform 0.2s;
-            }
-            .card-container:hover {
-                transform: scale(1.02);
-            }
-            .card-title {
-                font-size: 18px;
-                color: #ffffff;
-                margin-bottom: 5px;
-            }
-            .card-value {
-                font-size: 32px;
-                font-weight: bold;
-                color: #ffffff;
-            }
-        </style>
-    """, unsafe_allow_html=True)
-        # st.session_state.card_css_loaded = True
-
-    col1, col2, col3, col4 = st.columns(4, gap="large")
-
+    """Render the card styles and all summary cards in a single markdown element"""
     cards_data = [
         ("Empleados filtrados", total_emp),
         ("Días promedio", f"{avg_days:.1f}"),
@@ -233,24 +559,22 @@ def render_summary_cards(total_emp, avg_days, approved_pct, current_vacations_co
         ("En vacaciones", current_vacations_count)
     ]
 
-    for col, (title, value) in zip([col1, col2, col3, col4], cards_data):
-        with col:
-            st.markdown(f"""
-                <div class="card-container">
-                    <div class="card-title">{title}</div>
-                    <div class="card-value">{value}</div>
-                </div>
-            """, unsafe_allow_html=True)
+    cards_html = "".join(
+        f'<div class="card-container"><div class="card-title">{title}</div>'
+        f'<div class="card-value">{value}</div></div>'
+        for title, value in cards_data
+    )
+    st.markdown(f'{CARD_CSS}<div class="cards-row">{cards_html}</div>', unsafe_allow_html=True)
 
 
-def render_table_view(filtered_data):
+def render_table_view(data, filtered_data):
     st.subheader("📋 Vacaciones de Empleados")
     
     if filtered_data.empty:
         st.info("No hay datos para mostrar en la tabla")
         return
     
-    conflicts_detail = conflicts_detector(filtered_data)
+    conflicts_detail = visible_conflicts(data, filtered_data)
     formatted_table = table_formatter(filtered_data, conflicts_detail)
     
     column_config = {
@@ -284,18 +608,7 @@ def render_gantt_view(filtered_data):
         st.info("No hay datos para mostrar en el diagrama de Gantt")
         return
     
-    gantt_data = filtered_data[['Nombre', 'Fecha inicio', 'Fecha fin', 'Departamento']].copy()
-    gantt_data = gantt_data.rename(columns={'Nombre': 'Empleado'})
-    
-    fig = px.timeline(
-        gantt_data,
-        x_start="Fecha inicio",
-        x_end="Fecha fin",
-        y="Empleado",
-        color="Departamento"
-    )
-    fig.update_yaxes(autorange="reversed")
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(gantt_chart(filtered_data), use_container_width=True)
 
 
 def render_weekly_stats(filtered_data):
@@ -311,15 +624,7 @@ def render_weekly_stats(filtered_data):
         st.info("No hay datos de semanas para mostrar")
         return
     
-    fig_weekly = px.line(
-        weekly_data, 
-        x='week_start', 
-        y='empleados_vacaciones',
-        title='Número de Empleados en Vacaciones por Semana',
-        labels={'empleados_vacaciones': 'Empleados en Vacaciones', 'week_start': 'Semana'}
-    )
-    fig_weekly.update_traces(mode='lines+markers')
-    st.plotly_chart(fig_weekly, use_container_width=True)
+    st.plotly_chart(weekly_chart(weekly_data), use_container_width=True)
     
     metrics_data = weekly_data['empleados_vacaciones']
     col1, col2, col3 = st.columns(3)
@@ -335,6 +640,14 @@ def render_weekly_stats(filtered_data):
     display_weekly = weekly_data[['week_label', 'empleados_vacaciones']].copy()
     display_weekly.columns = ['Semana', 'Empleados en Vacaciones']
     st.dataframe(display_weekly, use_container_width=True)
+    
+    with st.expander("Empleados por semana"):
+        week_options = ['-'] + weekly_data['week_label'].tolist()
+        selected_week = st.selectbox("Selecciona una semana", week_options)
+        
+        if selected_week != '-':
+            week_start = weekly_data.loc[weekly_data['week_label'] == selected_week, 'week_start'].iloc[0]
+            st.dataframe(week_vacation_details(filtered_data, week_start), use_container_width=True)
 
 
 def render_department_dashboard(data, current_vacations):
@@ -344,14 +657,7 @@ def render_department_dashboard(data, current_vacations):
         st.info("No hay empleados actualmente en vacaciones para mostrar estadísticas por departamento")
         
         st.subheader("Distribución General por Departamento")
-        dept_distribution = data.groupby("Departamento").size().reset_index(name="Cantidad")
-        fig_general = px.bar(
-            dept_distribution, 
-            x="Departamento", 
-            y="Cantidad", 
-            title="Total de Registros de Vacaciones por Departamento"
-        )
-        st.plotly_chart(fig_general, use_container_width=True)
+        st.plotly_chart(department_totals_chart(data), use_container_width=True)
         return
     
     department_stats = department_percentages(data, current_vacations)
@@ -359,27 +665,10 @@ def render_department_dashboard(data, current_vacations):
     col1, col2 = st.columns(2)
     
     with col1:
-        fig_percentage = px.bar(
-            department_stats,
-            x='Departamento',
-            y='porcentaje_vacaciones',
-            title='Porcentaje de Empleados en Vacaciones por Departamento',
-            labels={'porcentaje_vacaciones': 'Porcentaje en Vacaciones (%)'},
-            color='porcentaje_vacaciones',
-            color_continuous_scale='Blues'
-        )
-        st.plotly_chart(fig_percentage, use_container_width=True)
+        st.plotly_chart(department_percentage_chart(department_stats), use_container_width=True)
     
     with col2:
-        vacation_distribution = current_vacations.groupby('Departamento').size().reset_index(name='count')
-        fig_donut = px.pie(
-            vacation_distribution,
-            values='count',
-            names='Departamento',
-            title='Distribución de Empleados Actualmente en Vacaciones'
-        )
-        fig_donut.update_traces(hole=0.4)
-        st.plotly_chart(fig_donut, use_container_width=True)
+        st.plotly_chart(current_vacations_chart(current_vacations), use_container_width=True)
     
     st.subheader("Resumen Consolidado por Departamento")
     
@@ -421,7 +710,7 @@ def render_current_vacations_tab(filtered_data, current_vacations):
         st.subheader("Próximas Vacaciones")
         upcoming_vacations = filtered_data[
             (filtered_data["Fecha inicio"] > today) &
-            (filtered_data["Aprobado"] == "Sí")
+            _approved_mask(filtered_data)
         ].sort_values("Fecha inicio").head(10)
         
         if not upcoming_vacations.empty:
@@ -432,12 +721,13 @@ def render_current_vacations_tab(filtered_data, current_vacations):
         return
     
     remaining_days = (current_vacations['Fecha fin'] - today).dt.days
+    active_departments = active_categories(current_vacations['Departamento'])
     
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("Total en vacaciones", len(current_vacations))
     with col2:
-        st.metric("Departamentos afectados", current_vacations['Departamento'].nunique())
+        st.metric("Departamentos afectados", len(active_departments))
     with col3:
         st.metric("Días restantes promedio", f"{remaining_days.mean():.0f}")
     
@@ -448,7 +738,7 @@ def render_current_vacations_tab(filtered_data, current_vacations):
     st.dataframe(employee_details, use_container_width=True)
     
     st.subheader("Filtrar por Departamento")
-    dept_options = ['-'] + sorted(current_vacations['Departamento'].unique().tolist())
+    dept_options = ['-'] + sorted(active_departments.tolist())
     selected_department = st.selectbox("Selecciona un departamento", dept_options)
     
     if selected_department != '-':
@@ -471,13 +761,13 @@ def main():
     # Optimize filter widgets
     selected_departments = st.sidebar.multiselect(
         "Departamento",
-        options=data["Departamento"].cat.categories.tolist(),
-        default=data["Departamento"].cat.categories.tolist()
+        options=data.attrs["dept_options"],
+        default=data.attrs["dept_options"]
     )
     selected_approval_status = st.sidebar.multiselect(
         "Estado aprobación",
-        options=data["Aprobado"].cat.categories.tolist(),
-        default=data["Aprobado"].cat.categories.tolist()
+        options=data.attrs["appr_options"],
+        default=data.attrs["appr_options"]
     )
     date_range = st.sidebar.date_input(
         "Rango de fechas",
@@ -507,7 +797,7 @@ def main():
     with tab1:
         view_type = st.radio("Selecciona vista", ["Tabla", "Diagrama de Gantt"], horizontal=True)
         if view_type == "Tabla":
-            render_table_view(filtered_data)
+            render_table_view(data, filtered_data)
         else:
             render_gantt_view(filtered_data)
     
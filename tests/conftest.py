@@ -2,44 +2,211 @@ import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import tempfile
-import os
+import io
+
+# Dates used by the fixtures, built once as NumPy datetime64 buffers rather
+# than parsed from strings for every frame.
+DAY = np.timedelta64(1, 'D')
+TODAY = np.datetime64('2024-07-15', 'ns')
+JULY_1 = np.datetime64('2024-07-01', 'ns')
+JULY_10 = np.datetime64('2024-07-10', 'ns')
+JULY_STARTS = JULY_1 + np.arange(4) * DAY        # 2024-07-01 .. 2024-07-04
+JULY_ENDS = JULY_STARTS + 7 * DAY                # 2024-07-08 .. 2024-07-11
+JULY_WEEKS = JULY_1 + np.arange(4) * 7 * DAY     # Mondays 2024-07-01 .. 2024-07-22
+
+# Category dtypes shared by every fixture frame, so their columns reuse one
+# categories index and compare on integer codes.
+DEPT_DTYPE = pd.CategoricalDtype(['Finanzas', 'Marketing', 'Operaciones', 'RRHH', 'Ventas'])
+APPROVAL_DTYPE = pd.CategoricalDtype(['No', 'Sí'])
+
+def pytest_addoption(parser):
+    parser.addoption("--runslow", action="store_true", default=False,
+                     help="also run tests marked slow (Excel I/O, large datasets)")
+
+def pytest_configure(config):
+    # pytest.ini uses a setup.cfg-style [tool:pytest] header, so its markers
+    # are not picked up; register them here
+    for marker in ("unit: Unit tests",
+                   "integration: Integration tests",
+                   "slow: Slow running tests, skipped unless --runslow is given",
+                   "functional: Functional requirement tests"):
+        config.addinivalue_line("markers", marker)
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="need --runslow option to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+@pytest.fixture(scope="session")
+def app_api():
+    """The app module, imported on first use instead of at collection time"""
+    import app
+    return app
 
 @pytest.fixture(scope="session")
 def mock_excel_data():
-    """Session-scoped fixture for mock Excel data"""
+    """Session-scoped fixture for mock Excel data, drawn from a fixed seed so failures reproduce"""
+    rng = np.random.default_rng(0)
     return {
         'ID': range(1, 161),  # 160 employees as per requirements
         'Nombre': [f'Employee_{i}' for i in range(1, 161)],
-        'Departamento': np.random.choice(['Marketing', 'Ventas', 'RRHH', 'Finanzas', 'Operaciones'], 160),
+        'Departamento': rng.choice(['Marketing', 'Ventas', 'RRHH', 'Finanzas', 'Operaciones'], 160),
         'Fecha inicio vacaciones': pd.date_range('2024-01-01', periods=160, freq='3D'),
         'Fecha fin vacaciones': pd.date_range('2024-01-08', periods=160, freq='3D'),
-        'Días': np.random.randint(5, 20, 160),
-        'Aprobado': np.random.choice(['Sí', 'No'], 160, p=[0.8, 0.2])
+        'Días': rng.integers(5, 20, 160),
+        'Aprobado': rng.choice(['Sí', 'No'], 160, p=[0.8, 0.2])
     }
 
+@pytest.fixture(scope="session")
+def excel_bytes(mock_excel_data):
+    """mock_excel_data written to an in-memory xlsx once per session"""
+    buffer = io.BytesIO()
+    pd.DataFrame(mock_excel_data).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+@pytest.fixture(scope="session")
+def today():
+    """The fixed 'today' (2024-07-15) that date-relative fixtures are built around"""
+    return pd.Timestamp(TODAY)
+
 @pytest.fixture
-def temp_excel_file(mock_excel_data):
-    """Create temporary Excel file for testing"""
-    df = pd.DataFrame(mock_excel_data)
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
-    df.to_excel(temp_file.name, index=False)
-    
-    yield temp_file.name
-    
-    # Cleanup
-    try:
-        os.unlink(temp_file.name)
-    except:
-        pass
+def frozen_now(monkeypatch, today):
+    """Pin pd.Timestamp.now() to 2024-07-15 for the duration of a test"""
+    now = today
+    monkeypatch.setattr(pd.Timestamp, 'now', classmethod(lambda cls, tz=None: now))
+    return now
 
 @pytest.fixture
 def conflict_test_data():
     """Fixture for testing conflict detection"""
     return pd.DataFrame({
         'Nombre': ['Alice', 'Bob', 'Charlie', 'Diana'],
-        'Departamento': pd.Categorical(['Marketing', 'Marketing', 'Ventas', 'Marketing']),
-        'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-05', '2024-07-01', '2024-07-03']),
-        'Fecha fin': pd.to_datetime(['2024-07-10', '2024-07-12', '2024-07-08', '2024-07-06']),
-        'Aprobado': pd.Categorical(['Sí', 'Sí', 'Sí', 'Sí'])
-    })
\ No newline at end of file
+        'Departamento': pd.array(['Marketing', 'Marketing', 'Ventas', 'Marketing'], dtype=DEPT_DTYPE),
+        'Fecha inicio': np.array(['2024-07-01', '2024-07-05', '2024-07-01', '2024-07-03'], dtype='datetime64[ns]'),
+        'Fecha fin': np.array(['2024-07-10', '2024-07-12', '2024-07-08', '2024-07-06'], dtype='datetime64[ns]'),
+        'Aprobado': pd.array(['Sí', 'Sí', 'Sí', 'Sí'], dtype=APPROVAL_DTYPE)
+    })
+
+# Session-scoped frames shared by the functional requirement tests. They are
+# built once per run: tests must not mutate them (take a .copy() first).
+
+@pytest.fixture(scope="session")
+def sample_vacation_data():
+    """Sample vacation data: two Marketing and one Ventas employee, one not approved"""
+    return pd.DataFrame({
+        'Nombre': ['Test Employee 1', 'Test Employee 2', 'Test Employee 3'],
+        'Departamento': pd.array(['Marketing', 'Ventas', 'Marketing'], dtype=DEPT_DTYPE),
+        'Fecha inicio': np.array(['2024-07-01', '2024-07-05', '2024-07-10'], dtype='datetime64[ns]'),
+        'Fecha fin': np.array(['2024-07-08', '2024-07-12', '2024-07-17'], dtype='datetime64[ns]'),
+        'Días': [8, 8, 8],
+        'Aprobado': pd.array(['Sí', 'Sí', 'No'], dtype=APPROVAL_DTYPE)
+    })
+
+@pytest.fixture(scope="session")
+def four_emp_mixed_approval():
+    """Four employees in three departments, half of them approved"""
+    return pd.DataFrame({
+        'Nombre': ['Emp1', 'Emp2', 'Emp3', 'Emp4'],
+        'Departamento': pd.array(['Marketing', 'Ventas', 'RRHH', 'Marketing'], dtype=DEPT_DTYPE),
+        'Fecha inicio': JULY_STARTS,
+        'Fecha fin': JULY_ENDS,
+        'Días': [8, 8, 8, 8],
+        'Aprobado': pd.array(['Sí', 'Sí', 'No', 'No'], dtype=APPROVAL_DTYPE)
+    })
+
+@pytest.fixture(scope="session")
+def three_emp_average_days():
+    """Three approved employees requesting 5, 10 and 15 days"""
+    return pd.DataFrame({
+        'Nombre': ['Emp1', 'Emp2', 'Emp3'],
+        'Departamento': pd.array(['Marketing', 'Ventas', 'RRHH'], dtype=DEPT_DTYPE),
+        'Fecha inicio': JULY_STARTS[:3],
+        'Fecha fin': JULY_ENDS[:3],
+        'Días': [5, 10, 15],
+        'Aprobado': pd.array(['Sí', 'Sí', 'Sí'], dtype=APPROVAL_DTYPE)
+    })
+
+@pytest.fixture(scope="session")
+def three_emp_conflict_marketing():
+    """Two overlapping Marketing vacations and one Ventas vacation"""
+    return pd.DataFrame({
+        'Nombre': ['Alice', 'Bob', 'Charlie'],
+        'Departamento': pd.array(['Marketing', 'Marketing', 'Ventas'], dtype=DEPT_DTYPE),
+        'Fecha inicio': np.array(['2024-07-01', '2024-07-05', '2024-07-01'], dtype='datetime64[ns]'),
+        'Fecha fin': np.array(['2024-07-10', '2024-07-12', '2024-07-08'], dtype='datetime64[ns]'),
+        'Aprobado': pd.array(['Sí', 'Sí', 'Sí'], dtype=APPROVAL_DTYPE)
+    })
+
+@pytest.fixture(scope="session")
+def two_emp_cross_department():
+    """Identical vacations in two different departments"""
+    return pd.DataFrame({
+        'Nombre': ['Alice', 'Bob'],
+        'Departamento': pd.array(['Marketing', 'Ventas'], dtype=DEPT_DTYPE),
+        'Fecha inicio': np.full(2, JULY_1),
+        'Fecha fin': np.full(2, JULY_10),
+        'Aprobado': pd.array(['Sí', 'Sí'], dtype=APPROVAL_DTYPE)
+    })
+
+@pytest.fixture(scope="session")
+def four_consecutive_weeks():
+    """One approved vacation per week across four consecutive weeks"""
+    return pd.DataFrame({
+        'Nombre': ['Emp1', 'Emp2', 'Emp3', 'Emp4'],
+        'Departamento': pd.array(['Marketing', 'Ventas', 'Marketing', 'RRHH'], dtype=DEPT_DTYPE),
+        'Fecha inicio': JULY_WEEKS,
+        'Fecha fin': JULY_WEEKS + 6 * DAY,
+        'Días': [7, 7, 7, 7],
+        'Aprobado': pd.array(['Sí', 'Sí', 'Sí', 'Sí'], dtype=APPROVAL_DTYPE)
+    })
+
+@pytest.fixture(scope="session")
+def six_emp_two_per_department():
+    """Two employees in each of three departments, all on the same dates"""
+    return pd.DataFrame({
+        'Nombre': ['Emp1', 'Emp2', 'Emp3', 'Emp4', 'Emp5', 'Emp6'],
+        'Departamento': pd.array(['Marketing', 'Marketing', 'Ventas', 'Ventas', 'RRHH', 'RRHH'], dtype=DEPT_DTYPE),
+        'Fecha inicio': np.full(6, JULY_1),
+        'Fecha fin': np.full(6, JULY_10),
+        'Días': [8] * 6,
+        'Aprobado': pd.array(['Sí'] * 6, dtype=APPROVAL_DTYPE)
+    })
+
+@pytest.fixture(scope="session")
+def twelve_emp_mixed_approval():
+    """Four employees per department, the last three not approved"""
+    return pd.DataFrame({
+        'Nombre': [f'Emp{i}' for i in range(1, 13)],
+        'Departamento': pd.array(['Marketing'] * 4 + ['Ventas'] * 4 + ['RRHH'] * 4, dtype=DEPT_DTYPE),
+        'Fecha inicio': np.full(12, JULY_1),
+        'Fecha fin': np.full(12, JULY_10),
+        'Días': [8] * 12,
+        'Aprobado': pd.array(['Sí'] * 9 + ['No'] * 3, dtype=APPROVAL_DTYPE)
+    })
+
+@pytest.fixture(scope="session")
+def current_vacation_window():
+    """Current, future and past vacations around 2024-07-15"""
+    return pd.DataFrame({
+        'Nombre': ['Current1', 'Current2', 'Future1', 'Past1'],
+        'Departamento': pd.array(['Marketing', 'Ventas', 'Marketing', 'RRHH'], dtype=DEPT_DTYPE),
+        # Started 5 and 2 days ago, starts in 5 days, started 15 days ago
+        'Fecha inicio': TODAY + np.array([-5, -2, 5, -15]) * DAY,
+        # Ends in 5, 3 and 10 days, ended 5 days ago
+        'Fecha fin': TODAY + np.array([5, 3, 10, -5]) * DAY,
+        'Aprobado': pd.array(['Sí', 'Sí', 'Sí', 'Sí'], dtype=APPROVAL_DTYPE)
+    })
+
+@pytest.fixture(scope="session")
+def current_approved_and_pending():
+    """An approved and a pending vacation, both in progress on 2024-07-15"""
+    return pd.DataFrame({
+        'Nombre': ['Approved', 'NotApproved'],
+        'Departamento': pd.array(['Marketing', 'Marketing'], dtype=DEPT_DTYPE),
+        'Fecha inicio': np.full(2, TODAY - 2 * DAY),
+        'Fecha fin': np.full(2, TODAY + 3 * DAY),
+        'Aprobado': pd.array(['Sí', 'No'], dtype=APPROVAL_DTYPE)
+    })
@@ -6,7 +6,7 @@ This script runs all tests for the vacation visualization module,
 covering the functional requirements specified in the technical assessment.
 
 Usage:
-    python run_tests.py [--coverage] [--detailed] [--requirements-only] [--validate]
+    python run_tests.py [--coverage] [--detailed] [--requirements-only] [--parallel] [--validate]
 """
 
 import subprocess
@@ -14,11 +14,11 @@ import sys
 import argparse
 from pathlib import Path
 
-def run_tests(coverage=False, detailed=False, requirements_only=False):
+def run_tests(coverage=False, detailed=False, requirements_only=False, parallel=False):
     """Run the test suite with specified options"""
     
-    # Base pytest command
-    cmd = ["python", "-m", "pytest"]
+    # Base pytest command; the runner always includes the slow tests
+    cmd = ["python", "-m", "pytest", "--runslow"]
     
     if requirements_only:
         # Run only functional requirement tests
@@ -42,6 +42,14 @@ def run_tests(coverage=False, detailed=False, requirements_only=False):
             "--cov-report=term-missing"
         ])
     
+    if parallel:
+        # Requires pytest-xdist; test classes share no state, so each class
+        # is sent whole to one worker
+        cmd.extend([
+            "-n", "auto",
+            "--dist=loadscope"
+        ])
+    
     if detailed:
         cmd.extend([
             "--tb=long",
@@ -95,6 +103,8 @@ if __name__ == "__main__":
                        help='Show detailed test output')
     parser.add_argument('--requirements-only', action='store_true',
                        help='Run only functional requirement tests')
+    parser.add_argument('--parallel', action='store_true',
+                       help='Run test classes in parallel (requires pytest-xdist)')
     parser.add_argument('--validate', action='store_true',
                        help='Validate requirements coverage')
     
@@ -107,7 +117,8 @@ if __name__ == "__main__":
     exit_code = run_tests(
         coverage=args.coverage,
         detailed=args.detailed, 
-        requirements_only=args.requirements_only
+        requirements_only=args.requirements_only,
+        parallel=args.parallel
     )
     
     sys.exit(exit_code)
\ No newline at end of file
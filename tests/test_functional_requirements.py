@@ -6,20 +6,45 @@ This file contains tests specifically designed to validate each functional
 requirement mentioned in the technical assessment PDF.
 """
 
+import io
 import pytest
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import tempfile
-import os
-from unittest.mock import patch, MagicMock
+from datetime import timedelta
+import time
+
+# The app module is imported lazily through the app_api fixture (conftest.py)
+
+
+def _sweepline_conflicts(df):
+    """
+    Reference for conflicts_detector: names of approved employees whose vacation
+    overlaps another in their department, found in one pass sorted by start.
+    """
+    approved = df[df['Aprobado'] == 'Sí'].sort_values(['Departamento', 'Fecha inicio'])
+    conflicted = set()
+    latest_end = {}  # department -> (name, end) of the furthest-reaching vacation so far
+    for name, dept, start, end in zip(approved['Nombre'], approved['Departamento'],
+                                      approved['Fecha inicio'], approved['Fecha fin']):
+        holder = latest_end.get(dept)
+        if holder is not None and start <= holder[1]:
+            conflicted.update((name, holder[0]))
+        if holder is None or end > holder[1]:
+            latest_end[dept] = (name, end)
+    return conflicted
+
+
+def _best_time(fn, rounds=5, warmup_rounds=2):
+    """Fastest of several timed calls after warm-up, a low-noise estimate of fn's cost"""
+    for _ in range(warmup_rounds):
+        fn()
+    
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
 
-# Import functions from your app
-from app import (
-    data_loader, conflicts_detector, table_formatter, 
-    employees_vacations_per_week, department_percentages,
-    get_filtered_data, get_current_vacations, calculate_summary_metrics
-)
 
 class TestRequirement1:
     """
@@ -28,12 +53,12 @@ class TestRequirement1:
     """
     
     @pytest.mark.functional
-    def test_dynamic_vacation_visualization(self, sample_vacation_data):
+    def test_dynamic_vacation_visualization(self, app_api, sample_vacation_data):
         """Test that vacation periods can be visualized dynamically"""
         
         # Test table format visualization
-        conflicts = conflicts_detector(sample_vacation_data)
-        formatted_table = table_formatter(sample_vacation_data, conflicts)
+        conflicts = app_api.conflicts_detector(sample_vacation_data)
+        formatted_table = app_api.table_formatter(sample_vacation_data, conflicts)
         
         # Verify table contains all required columns for visualization
         required_columns = ['Empleado', 'Departamento', 'Inicio de Vacaciones', 'Fin de Vacaciones']
@@ -66,68 +91,38 @@ class TestRequirement2:
     """
     
     @pytest.mark.functional
-    def test_department_filtering(self):
-        """Test filtering by department functionality"""
-        
-        test_data = pd.DataFrame({
-            'Nombre': ['Emp1', 'Emp2', 'Emp3', 'Emp4'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas', 'RRHH', 'Marketing']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-02', '2024-07-03', '2024-07-04']),
-            'Fecha fin': pd.to_datetime(['2024-07-08', '2024-07-09', '2024-07-10', '2024-07-11']),
-            'Aprobado': pd.Categorical(['Sí', 'Sí', 'Sí', 'No'])
-        })
-        
-        # Test single department filter
-        marketing_only = get_filtered_data(
-            test_data,
-            departments=['Marketing'],
-            approval_status=['Sí', 'No'],
-            date_range=[]
-        )
-        assert len(marketing_only) == 2
-        assert all(marketing_only['Departamento'] == 'Marketing')
-        
-        # Test multiple department filter
-        marketing_ventas = get_filtered_data(
-            test_data,
-            departments=['Marketing', 'Ventas'],
-            approval_status=['Sí', 'No'],
+    @pytest.mark.parametrize("departments,approval_status,expected_names", [
+        (['Marketing'], ['Sí', 'No'], {'Emp1', 'Emp4'}),
+        (['Marketing', 'Ventas'], ['Sí', 'No'], {'Emp1', 'Emp2', 'Emp4'}),
+        (['Marketing', 'Ventas', 'RRHH'], ['Sí'], {'Emp1', 'Emp2'}),
+        (['Marketing', 'Ventas', 'RRHH'], ['No'], {'Emp3', 'Emp4'}),
+    ], ids=['single_department', 'multiple_departments', 'approved_only', 'not_approved_only'])
+    def test_department_and_approval_filtering(self, app_api, four_emp_mixed_approval,
+                                               departments, approval_status, expected_names):
+        """Test filtering by department and approval status"""
+        
+        filtered = app_api.get_filtered_data(
+            four_emp_mixed_approval,
+            departments=departments,
+            approval_status=approval_status,
             date_range=[]
         )
-        assert len(marketing_ventas) == 3
-        assert set(marketing_ventas['Departamento'].unique()) <= {'Marketing', 'Ventas'}
+        assert len(filtered) == len(expected_names)
+        assert set(filtered['Nombre']) == expected_names
+        assert set(filtered['Departamento']) <= set(departments)
+        assert set(filtered['Aprobado']) <= set(approval_status)
     
     @pytest.mark.functional
-    def test_approval_status_filtering(self):
-        """Test filtering by approval status"""
-        
-        test_data = pd.DataFrame({
-            'Nombre': ['Emp1', 'Emp2', 'Emp3', 'Emp4'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas', 'RRHH', 'Marketing']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-02', '2024-07-03', '2024-07-04']),
-            'Fecha fin': pd.to_datetime(['2024-07-08', '2024-07-09', '2024-07-10', '2024-07-11']),
-            'Aprobado': pd.Categorical(['Sí', 'Sí', 'No', 'No'])
-        })
+    def test_filtering_with_category_index(self, app_api, four_emp_mixed_approval):
+        """Test that the categories Index can be passed directly as the selection"""
         
-        # Test approved only filter
-        approved_only = get_filtered_data(
-            test_data,
-            departments=['Marketing', 'Ventas', 'RRHH'],
-            approval_status=['Sí'],
+        filtered = app_api.get_filtered_data(
+            four_emp_mixed_approval,
+            departments=four_emp_mixed_approval['Departamento'].cat.categories,
+            approval_status=four_emp_mixed_approval['Aprobado'].cat.categories,
             date_range=[]
         )
-        assert len(approved_only) == 2
-        assert all(approved_only['Aprobado'] == 'Sí')
-        
-        # Test not approved only filter
-        not_approved_only = get_filtered_data(
-            test_data,
-            departments=['Marketing', 'Ventas', 'RRHH'],
-            approval_status=['No'],
-            date_range=[]
-        )
-        assert len(not_approved_only) == 2
-        assert all(not_approved_only['Aprobado'] == 'No')
+        assert len(filtered) == len(four_emp_mixed_approval)
     
 
 class TestRequirement3:
@@ -136,41 +131,28 @@ class TestRequirement3:
     """
     
     @pytest.mark.functional
-    def test_conflict_detection_same_department(self):
-        """Test conflict detection within same department"""
-        
-        conflict_data = pd.DataFrame({
-            'Nombre': ['Alice', 'Bob', 'Charlie'],
-            'Departamento': pd.Categorical(['Marketing', 'Marketing', 'Ventas']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-05', '2024-07-01']),
-            'Fecha fin': pd.to_datetime(['2024-07-10', '2024-07-12', '2024-07-08']),
-            'Aprobado': pd.Categorical(['Sí', 'Sí', 'Sí'])
-        })
-        
-        conflicts = conflicts_detector(conflict_data)
-        
-        # Should detect conflict between Alice and Bob (both Marketing, overlapping dates)
-        conflict_names = [c['Nombre'] for c in conflicts]
-        assert 'Alice' in conflict_names or 'Bob' in conflict_names
-        
-        # Should not detect conflict with Charlie (different department)
-        marketing_conflicts = [c for c in conflicts if c['Departamento'] == 'Marketing']
-        assert len(marketing_conflicts) > 0
+    @pytest.mark.parametrize("frame,expected_names", [
+        # Alice and Bob overlap in Marketing; Charlie is alone in Ventas
+        ('three_emp_conflict_marketing', {'Alice', 'Bob'}),
+        # Same dates, different departments: not a conflict
+        ('two_emp_cross_department', set()),
+    ], ids=['same_department', 'different_departments'])
+    def test_conflict_detection(self, app_api, request, frame, expected_names):
+        """Test that conflicts are detected only within the same department"""
+        
+        data = request.getfixturevalue(frame)
+        conflicts = app_api.conflicts_detector(data)
+        
+        assert {c['Nombre'] for c in conflicts} == expected_names
+        assert _sweepline_conflicts(data) == expected_names
+        assert all(c['Departamento'] == 'Marketing' for c in conflicts)
     
     @pytest.mark.functional
-    def test_no_conflict_different_departments(self):
-        """Test that conflicts are not detected across different departments"""
-        
-        no_conflict_data = pd.DataFrame({
-            'Nombre': ['Alice', 'Bob'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-01']),
-            'Fecha fin': pd.to_datetime(['2024-07-10', '2024-07-10']),
-            'Aprobado': pd.Categorical(['Sí', 'Sí'])
-        })
+    def test_conflicts_match_sweepline_reference(self, app_api, prepared_160):
+        """Test conflict detection on the 160-employee dataset against a sweep-line reference"""
         
-        conflicts = conflicts_detector(no_conflict_data)
-        assert len(conflicts) == 0, "Should not detect conflicts across different departments"
+        conflicts = app_api.conflicts_detector(prepared_160)
+        assert {c['Nombre'] for c in conflicts} == _sweepline_conflicts(prepared_160)
     
 
 class TestRequirement4:
@@ -180,20 +162,12 @@ class TestRequirement4:
     """
     
     @pytest.mark.functional
-    def test_weekly_employee_statistics(self):
+    def test_weekly_employee_statistics(self, app_api, four_consecutive_weeks):
         """Test weekly vacation statistics calculation"""
         
-        # Create data spanning multiple weeks
-        test_data = pd.DataFrame({
-            'Nombre': ['Emp1', 'Emp2', 'Emp3', 'Emp4'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas', 'Marketing', 'RRHH']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-08', '2024-07-15', '2024-07-22']),
-            'Fecha fin': pd.to_datetime(['2024-07-07', '2024-07-14', '2024-07-21', '2024-07-28']),
-            'Días': [7, 7, 7, 7],
-            'Aprobado': pd.Categorical(['Sí', 'Sí', 'Sí', 'Sí'])
-        })
+        test_data = four_consecutive_weeks
         
-        weekly_stats = employees_vacations_per_week(test_data)
+        weekly_stats = app_api.employees_vacations_per_week(test_data)
         
         # Should return weekly statistics
         assert isinstance(weekly_stats, pd.DataFrame)
@@ -205,38 +179,24 @@ class TestRequirement4:
         assert weekly_stats['empleados_vacaciones'].sum() >= len(test_data)
     
     @pytest.mark.functional 
-    def test_approval_percentage_calculation(self):
+    def test_approval_percentage_calculation(self, app_api, four_emp_mixed_approval):
         """Test approval percentage calculation"""
         
-        test_data = pd.DataFrame({
-            'Nombre': ['Emp1', 'Emp2', 'Emp3', 'Emp4'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas', 'Marketing', 'RRHH']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-02', '2024-07-03', '2024-07-04']),
-            'Fecha fin': pd.to_datetime(['2024-07-08', '2024-07-09', '2024-07-10', '2024-07-11']),
-            'Días': [8, 8, 8, 8],
-            'Aprobado': pd.Categorical(['Sí', 'Sí', 'No', 'No'])  # 50% approved
-        })
+        test_data = four_emp_mixed_approval
         
-        total_emp, avg_days, approved_pct = calculate_summary_metrics(test_data)
+        total_emp, avg_days, approved_pct = app_api.calculate_summary_metrics(test_data)
         
         assert approved_pct == 50.0, f"Expected 50% approval rate, got {approved_pct}%"
         assert total_emp == 4
         assert avg_days == 8.0
     
     @pytest.mark.functional
-    def test_average_days_calculation(self):
+    def test_average_days_calculation(self, app_api, three_emp_average_days):
         """Test average vacation days calculation"""
         
-        test_data = pd.DataFrame({
-            'Nombre': ['Emp1', 'Emp2', 'Emp3'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas', 'RRHH']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-02', '2024-07-03']),
-            'Fecha fin': pd.to_datetime(['2024-07-08', '2024-07-09', '2024-07-10']),
-            'Días': [5, 10, 15],  # Average should be 10
-            'Aprobado': pd.Categorical(['Sí', 'Sí', 'Sí'])
-        })
+        test_data = three_emp_average_days
         
-        total_emp, avg_days, approved_pct = calculate_summary_metrics(test_data)
+        total_emp, avg_days, approved_pct = app_api.calculate_summary_metrics(test_data)
         
         assert avg_days == 10.0, f"Expected average of 10 days, got {avg_days}"
 
@@ -247,12 +207,11 @@ class TestRequirement5:
     """
     
     @pytest.mark.functional
-    def test_excel_file_loading(self, temp_excel_file):
+    def test_excel_file_loading(self, app_api, excel_bytes):
         """Test loading data from Excel file"""
         
-        # Test loading from file path
-        with open(temp_excel_file, 'rb') as f:
-            data = data_loader(f)
+        # Test loading from an uploaded file's bytes
+        data = app_api.data_loader(io.BytesIO(excel_bytes))
         
         # Verify data was loaded correctly
         assert isinstance(data, pd.DataFrame)
@@ -264,11 +223,10 @@ class TestRequirement5:
             assert col in data.columns, f"Missing required column: {col}"
     
     @pytest.mark.functional
-    def test_excel_data_type_conversion(self, temp_excel_file):
+    def test_excel_data_type_conversion(self, app_api, excel_bytes):
         """Test that Excel data is properly converted to appropriate types"""
         
-        with open(temp_excel_file, 'rb') as f:
-            data = data_loader(f)
+        data = app_api.data_loader(io.BytesIO(excel_bytes))
         
         # Verify data types after loading
         assert pd.api.types.is_datetime64_any_dtype(data['Fecha inicio'])
@@ -285,23 +243,15 @@ class TestRequirement6:
     """
     
     @pytest.mark.functional
-    def test_department_percentage_calculation(self):
+    def test_department_percentage_calculation(self, app_api, six_emp_two_per_department):
         """Test department-wise vacation percentage calculation"""
         
-        # Create test data with known distribution
-        all_employees = pd.DataFrame({
-            'Nombre': ['Emp1', 'Emp2', 'Emp3', 'Emp4', 'Emp5', 'Emp6'],
-            'Departamento': pd.Categorical(['Marketing', 'Marketing', 'Ventas', 'Ventas', 'RRHH', 'RRHH']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01'] * 6),
-            'Fecha fin': pd.to_datetime(['2024-07-10'] * 6),
-            'Días': [8] * 6,
-            'Aprobado': pd.Categorical(['Sí'] * 6)
-        })
+        all_employees = six_emp_two_per_department
         
         # Only some employees currently on vacation
         current_vacations = all_employees.iloc[:4]  # 2 Marketing, 2 Ventas, 0 RRHH
         
-        dept_stats = department_percentages(all_employees, current_vacations)
+        dept_stats = app_api.department_percentages(all_employees, current_vacations)
         
         # Verify structure
         assert isinstance(dept_stats, pd.DataFrame)
@@ -319,20 +269,13 @@ class TestRequirement6:
         assert rrhh_row['porcentaje_vacaciones'] == 0.0
     
     @pytest.mark.functional
-    def test_department_dashboard_data_structure(self):
+    def test_department_dashboard_data_structure(self, app_api, twelve_emp_mixed_approval):
         """Test that department dashboard data is properly structured"""
         
-        test_data = pd.DataFrame({
-            'Nombre': [f'Emp{i}' for i in range(1, 13)],
-            'Departamento': pd.Categorical(['Marketing'] * 4 + ['Ventas'] * 4 + ['RRHH'] * 4),
-            'Fecha inicio': pd.to_datetime(['2024-07-01'] * 12),
-            'Fecha fin': pd.to_datetime(['2024-07-10'] * 12),
-            'Días': [8] * 12,
-            'Aprobado': pd.Categorical(['Sí'] * 9 + ['No'] * 3)
-        })
+        test_data = twelve_emp_mixed_approval
         
         current_vacations = test_data[test_data['Aprobado'] == 'Sí']
-        dept_stats = department_percentages(test_data, current_vacations)
+        dept_stats = app_api.department_percentages(test_data, current_vacations)
         
         # Should have data for all departments
         assert len(dept_stats) == 3  # Marketing, Ventas, RRHH
@@ -349,30 +292,12 @@ class TestRequirement7:
     """
     
     @pytest.mark.functional
-    def test_current_vacations_identification(self):
+    def test_current_vacations_identification(self, app_api, current_vacation_window, today):
         """Test identification of employees currently on vacation"""
         
-        today = pd.Timestamp('2024-07-15')  # Fixed date for testing
-        
-        test_data = pd.DataFrame({
-            'Nombre': ['Current1', 'Current2', 'Future1', 'Past1'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas', 'Marketing', 'RRHH']),
-            'Fecha inicio': [
-                today - timedelta(days=5),   # Started 5 days ago
-                today - timedelta(days=2),   # Started 2 days ago  
-                today + timedelta(days=5),   # Starts in 5 days
-                today - timedelta(days=15)   # Started 15 days ago
-            ],
-            'Fecha fin': [
-                today + timedelta(days=5),   # Ends in 5 days
-                today + timedelta(days=3),   # Ends in 3 days
-                today + timedelta(days=10),  # Ends in 10 days
-                today - timedelta(days=5)    # Ended 5 days ago
-            ],
-            'Aprobado': pd.Categorical(['Sí', 'Sí', 'Sí', 'Sí'])
-        })
+        test_data = current_vacation_window
         
-        current_vacations = get_current_vacations(test_data, today)
+        current_vacations = app_api.get_current_vacations(test_data, today)
         
         # Should identify only employees currently on vacation
         assert len(current_vacations) == 2
@@ -383,39 +308,31 @@ class TestRequirement7:
         assert 'Past1' not in current_names
     
     @pytest.mark.functional
-    def test_current_vacations_approved_only(self):
+    def test_current_vacations_approved_only(self, app_api, current_approved_and_pending, today):
         """Test that only approved vacations are considered current"""
         
-        today = pd.Timestamp('2024-07-15')
-        
-        test_data = pd.DataFrame({
-            'Nombre': ['Approved', 'NotApproved'],
-            'Departamento': pd.Categorical(['Marketing', 'Marketing']),
-            'Fecha inicio': [today - timedelta(days=2), today - timedelta(days=2)],
-            'Fecha fin': [today + timedelta(days=3), today + timedelta(days=3)],
-            'Aprobado': pd.Categorical(['Sí', 'No'])
-        })
+        test_data = current_approved_and_pending
         
-        current_vacations = get_current_vacations(test_data, today)
+        current_vacations = app_api.get_current_vacations(test_data, today)
         
         # Should only include approved vacation
         assert len(current_vacations) == 1
         assert current_vacations.iloc[0]['Nombre'] == 'Approved'
     
     @pytest.mark.functional
-    def test_current_vacations_real_time(self):
+    def test_current_vacations_real_time(self, app_api, frozen_now):
         """Test current vacations with real-time date"""
         
-        # Test with actual current time
+        # Clock pinned by frozen_now, so the default "today" is deterministic
         real_time_data = pd.DataFrame({
             'Nombre': ['Employee1'],
             'Departamento': pd.Categorical(['Marketing']),
-            'Fecha inicio': [pd.Timestamp.now() - timedelta(days=1)],
-            'Fecha fin': [pd.Timestamp.now() + timedelta(days=5)],
+            'Fecha inicio': [frozen_now - timedelta(days=1)],
+            'Fecha fin': [frozen_now + timedelta(days=5)],
             'Aprobado': pd.Categorical(['Sí'])
         })
         
-        current_vacations = get_current_vacations(real_time_data)
+        current_vacations = app_api.get_current_vacations(real_time_data)
         
         # Should work with real-time calculation
         assert isinstance(current_vacations, pd.DataFrame)
@@ -427,77 +344,60 @@ class TestDataIntegrity:
     """Test data integrity and business rules"""
     
     @pytest.mark.functional
-    def test_160_employees_requirement(self, mock_excel_data):
+    def test_160_employees_requirement(self, app_api, prepared_160):
         """Test that system can handle 160 employees as specified in requirements"""
         
-        df = pd.DataFrame(mock_excel_data)
+        data = prepared_160
         
         # Verify we have exactly 160 employees as specified
-        assert len(df) == 160, "Should handle exactly 160 employees as per requirements"
-        
-        # Test that all functions work with this data size
-        data = df.copy()
-        data['Fecha inicio'] = pd.to_datetime(data['Fecha inicio vacaciones'])
-        data['Fecha fin'] = pd.to_datetime(data['Fecha fin vacaciones'])
-        data['Departamento'] = data['Departamento'].astype('category')
-        data['Aprobado'] = data['Aprobado'].astype('category')
+        assert len(data) == 160, "Should handle exactly 160 employees as per requirements"
         
         # Test core functions with full dataset
-        conflicts = conflicts_detector(data)
+        conflicts = app_api.conflicts_detector(data)
         assert isinstance(conflicts, list)
         
-        weekly_stats = employees_vacations_per_week(data)
+        weekly_stats = app_api.employees_vacations_per_week(data)
         assert isinstance(weekly_stats, pd.DataFrame)
         
-        total_emp, avg_days, approved_pct = calculate_summary_metrics(data)
+        total_emp, avg_days, approved_pct = app_api.calculate_summary_metrics(data)
         assert total_emp == 160
     
     @pytest.mark.functional
-    def test_performance_with_large_dataset(self, mock_excel_data):
-        """Test system performance with required data size"""
-        
-        df = pd.DataFrame(mock_excel_data)
-        data = df.copy()
-        data['Fecha inicio'] = pd.to_datetime(data['Fecha inicio vacaciones'])
-        data['Fecha fin'] = pd.to_datetime(data['Fecha fin vacaciones'])
-        data['Departamento'] = data['Departamento'].astype('category')
-        data['Aprobado'] = data['Aprobado'].astype('category')
-        
-        import time
-        
-        # Test that operations complete in reasonable time
-        start_time = time.time()
-        
-        # Run all major operations
-        filtered_data = get_filtered_data(
-            data,
-            departments=data['Departamento'].cat.categories.tolist(),
-            approval_status=['Sí', 'No'],
-            date_range=[]
-        )
-        conflicts = conflicts_detector(filtered_data)
-        weekly_stats = employees_vacations_per_week(filtered_data)
-        current_vacations = get_current_vacations(filtered_data)
-        
-        end_time = time.time()
-        processing_time = end_time - start_time
-        
-        # Should complete within reasonable time (adjust threshold as needed)
-        assert processing_time < 5.0, f"Processing took {processing_time:.2f} seconds, should be under 5 seconds"
+    @pytest.mark.parametrize("operation", ['filter', 'conflicts', 'weekly', 'current'])
+    def test_performance_with_large_dataset(self, app_api, prepared_160, operation):
+        """Test system performance with required data size, one operation at a time"""
+        
+        data = prepared_160
+        
+        # Cached functions are timed through __wrapped__ so every round
+        # measures the computation rather than a cache hit
+        operations = {
+            'filter': lambda: app_api.get_filtered_data(
+                data,
+                departments=data['Departamento'].cat.categories,
+                approval_status=['Sí', 'No'],
+                date_range=[]
+            ),
+            'conflicts': lambda: app_api.conflicts_detector.__wrapped__(data),
+            'weekly': lambda: app_api.employees_vacations_per_week.__wrapped__(data),
+            'current': lambda: app_api.get_current_vacations.__wrapped__(data),
+        }
+        
+        best_time = _best_time(operations[operation])
+        
+        assert best_time < 0.1, f"{operation} took {best_time * 1000:.1f} ms, should be under 100 ms"
 
 
 # Additional fixtures for requirements testing
-@pytest.fixture
-def sample_vacation_data():
-    """Sample vacation data for testing"""
-    return pd.DataFrame({
-        'Nombre': ['Test Employee 1', 'Test Employee 2', 'Test Employee 3'],
-        'Departamento': pd.Categorical(['Marketing', 'Ventas', 'Marketing']),
-        'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-05', '2024-07-10']),
-        'Fecha fin': pd.to_datetime(['2024-07-08', '2024-07-12', '2024-07-17']),
-        'Días': [8, 8, 8],
-        'Aprobado': pd.Categorical(['Sí', 'Sí', 'No'])
-    })
+@pytest.fixture(scope="module")
+def prepared_160(mock_excel_data):
+    """The 160-employee mock data with the loader's date and category conversions"""
+    data = pd.DataFrame(mock_excel_data)
+    data['Fecha inicio'] = pd.to_datetime(data['Fecha inicio vacaciones'])
+    data['Fecha fin'] = pd.to_datetime(data['Fecha fin vacaciones'])
+    data['Departamento'] = data['Departamento'].astype('category')
+    data['Aprobado'] = data['Aprobado'].astype('category')
+    return data
 
 
 if __name__ == "__main__":
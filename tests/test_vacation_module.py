@@ -2,205 +2,368 @@ import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import tempfile
+import io
 import os
-from unittest.mock import patch, MagicMock
-import streamlit as st
 
-# Import functions from your app
-from app import (
-    data_loader, conflicts_detector, table_formatter, 
-    employees_vacations_per_week, department_percentages,
-    get_filtered_data, get_current_vacations, calculate_summary_metrics
-)
+# The app module is imported lazily through the app_api fixture (conftest.py)
+
+# Category dtypes shared by every frame in this module
+DEPT_DTYPE = pd.CategoricalDtype(['Marketing', 'RRHH', 'Ventas'])
+APPROVAL_DTYPE = pd.CategoricalDtype(['No', 'Sí'])
+
+# Five valid vacation rows in the workbook layout, as read by data_loader
+LOADER_DATA = {
+    'ID': [1, 2, 3, 4, 5],
+    'Nombre': ['Juan Pérez', 'María García', 'Carlos López', 'Ana Martín', 'Luis Rodríguez'],
+    'Departamento': ['Marketing', 'Ventas', 'Marketing', 'RRHH', 'Ventas'],
+    'Fecha inicio vacaciones': ['2024-07-01', '2024-07-05', '2024-07-03', '2024-07-10', '2024-07-15'],
+    'Fecha fin vacaciones': ['2024-07-10', '2024-07-12', '2024-07-08', '2024-07-17', '2024-07-22'],
+    'Días': [10, 8, 6, 8, 8],
+    'Aprobado': ['Sí', 'Sí', 'No', 'Sí', 'Sí']
+}
+
+# Employee names, formatted once and shared by reference
+NAMES_10 = tuple(f'Emp{i}' for i in range(1, 11))
+EMPLOYEE_NAMES_20 = np.char.add('Employee_', np.arange(1, 21).astype(str)).astype(object)
+
+# Frames shared by the tests below, built once at import. Tests only read
+# them; take a .copy() before mutating one.
+
+# Three overlapping Marketing vacations and one Ventas vacation
+FROZEN_CONFLICT_DATA = pd.DataFrame({
+    'Nombre': ['Employee A', 'Employee B', 'Employee C', 'Employee D'],
+    'Departamento': pd.array(['Marketing', 'Marketing', 'Ventas', 'Marketing'], dtype=DEPT_DTYPE),
+    'Fecha inicio': np.array(['2024-07-01', '2024-07-05', '2024-07-01', '2024-07-03'], dtype='datetime64[ns]'),
+    'Fecha fin': np.array(['2024-07-10', '2024-07-12', '2024-07-08', '2024-07-06'], dtype='datetime64[ns]'),
+    'Aprobado': pd.array(['Sí', 'Sí', 'Sí', 'Sí'], dtype=APPROVAL_DTYPE)
+})
+
+# FROZEN_CONFLICT_DATA plus an unapproved Marketing overlap and a second
+# Ventas vacation, for comparing filtered views of one conflict graph
+FROZEN_VISIBLE_CONFLICT_DATA = pd.DataFrame({
+    'Nombre': ['Employee A', 'Employee B', 'Employee C', 'Employee D', 'Employee E', 'Employee F'],
+    'Departamento': pd.array(['Marketing', 'Marketing', 'Ventas', 'Marketing', 'Marketing', 'Ventas'], dtype=DEPT_DTYPE),
+    'Fecha inicio': np.array(['2024-07-01', '2024-07-05', '2024-07-01', '2024-07-03', '2024-07-04', '2024-07-06'], dtype='datetime64[ns]'),
+    'Fecha fin': np.array(['2024-07-10', '2024-07-12', '2024-07-08', '2024-07-06', '2024-07-09', '2024-07-09'], dtype='datetime64[ns]'),
+    'Aprobado': pd.array(['Sí', 'Sí', 'Sí', 'Sí', 'No', 'Sí'], dtype=APPROVAL_DTYPE)
+})
+
+# Four employees in three departments, one not approved
+FROZEN_FILTER_DATA = pd.DataFrame({
+    'Nombre': ['Emp1', 'Emp2', 'Emp3', 'Emp4'],
+    'Departamento': pd.array(['Marketing', 'Ventas', 'Marketing', 'RRHH'], dtype=DEPT_DTYPE),
+    'Fecha inicio': np.array(['2024-07-01', '2024-07-05', '2024-07-10', '2024-07-15'], dtype='datetime64[ns]'),
+    'Fecha fin': np.array(['2024-07-08', '2024-07-12', '2024-07-17', '2024-07-22'], dtype='datetime64[ns]'),
+    'Aprobado': pd.array(['Sí', 'No', 'Sí', 'Sí'], dtype=APPROVAL_DTYPE)
+})
+
+# Four employees with known days and approval share
+FROZEN_STATS_DATA = pd.DataFrame({
+    'Nombre': ['Emp1', 'Emp2', 'Emp3', 'Emp4'],
+    'Departamento': pd.array(['Marketing', 'Ventas', 'Marketing', 'RRHH'], dtype=DEPT_DTYPE),
+    'Fecha inicio': np.array(['2024-07-01', '2024-07-05', '2024-07-10', '2024-07-15'], dtype='datetime64[ns]'),
+    'Fecha fin': np.array(['2024-07-10', '2024-07-12', '2024-07-17', '2024-07-22'], dtype='datetime64[ns]'),
+    'Días': [10, 8, 8, 8],
+    'Aprobado': pd.array(['Sí', 'Sí', 'No', 'Sí'], dtype=APPROVAL_DTYPE)
+})
+
+# Two non-conflicting vacations for the table formatter
+FROZEN_TABLE_DATA = pd.DataFrame({
+    'Nombre': ['Employee1', 'Employee2'],
+    'Departamento': pd.array(['Marketing', 'Ventas'], dtype=DEPT_DTYPE),
+    'Fecha inicio': np.array(['2024-07-01', '2024-07-05'], dtype='datetime64[ns]'),
+    'Fecha fin': np.array(['2024-07-10', '2024-07-12'], dtype='datetime64[ns]'),
+    'Días': [10, 8],
+    'Aprobado': pd.array(['Sí', 'Sí'], dtype=APPROVAL_DTYPE)
+})
+
+# Ten employees in three departments, two not approved
+FROZEN_DASHBOARD_DATA = pd.DataFrame({
+    'Nombre': NAMES_10,
+    # Marketing x4, Ventas x3, RRHH x3 as codes into DEPT_DTYPE
+    'Departamento': pd.Categorical.from_codes(np.repeat([0, 2, 1], [4, 3, 3]), dtype=DEPT_DTYPE),
+    'Fecha inicio': np.array(['2024-07-01'] * 10, dtype='datetime64[ns]'),
+    'Fecha fin': np.array(['2024-07-10'] * 10, dtype='datetime64[ns]'),
+    'Días': [8] * 10,
+    # Sí x8, No x2 as codes into APPROVAL_DTYPE
+    'Aprobado': pd.Categorical.from_codes(np.repeat([1, 0], [8, 2]), dtype=APPROVAL_DTYPE)
+})
+
+# Twenty staggered vacations in the raw workbook layout, with days drawn from
+# a fixed seed so failures reproduce
+INTEGRATION_STARTS = np.datetime64('2024-07-01', 'ns') + np.arange(20) * np.timedelta64(2, 'D')
+INTEGRATION_DIAS = np.random.default_rng(seed=0).integers(5, 15, 20)
+FROZEN_INTEGRATION_DATA = pd.DataFrame({
+    'ID': range(1, 21),
+    'Nombre': EMPLOYEE_NAMES_20,
+    'Departamento': pd.array(['Marketing'] * 8 + ['Ventas'] * 7 + ['RRHH'] * 5, dtype=DEPT_DTYPE),
+    'Fecha inicio vacaciones': INTEGRATION_STARTS,
+    'Fecha fin vacaciones': INTEGRATION_STARTS + np.timedelta64(7, 'D'),
+    'Días': INTEGRATION_DIAS,
+    'Aprobado': pd.array(['Sí'] * 15 + ['No'] * 5, dtype=APPROVAL_DTYPE)
+})
+
+# xlsxwriter is a much faster writer than openpyxl; the fixtures only need it
+# for writing, reads still go through data_loader's engine.
+try:
+    import xlsxwriter  # noqa: F401
+    EXCEL_WRITER = 'xlsxwriter'
+except ImportError:
+    EXCEL_WRITER = 'openpyxl'
+
+# Serialized workbooks keyed on repr() of their source dict, so each distinct
+# dataset is written once per run.
+_EXCEL_CACHE = {}
+
+def create_test_excel(data):
+    """In-memory Excel file for data, rewound and ready to read"""
+    key = repr(data)
+    if key not in _EXCEL_CACHE:
+        buffer = io.BytesIO()
+        pd.DataFrame(data).to_excel(buffer, index=False, engine=EXCEL_WRITER)
+        _EXCEL_CACHE[key] = buffer.getvalue()
+    return io.BytesIO(_EXCEL_CACHE[key])
+
+def _cat_all_equal(ser, val):
+    """Whether every row of a categorical Series is val, compared on its integer codes"""
+    return bool((ser.cat.codes.to_numpy() == ser.cat.categories.get_loc(val)).all())
+
+# dtypes data_loader guarantees; datetime resolution varies by pandas version
+# and is left out of the comparison
+LOADED_DTYPES = pd.Series({
+    'Fecha inicio': 'datetime64',
+    'Fecha fin': 'datetime64',
+    'Departamento': 'category',
+    'Aprobado': 'category'
+})
+
+def _assert_loaded_dtypes(data):
+    """Compare the loaded columns' dtypes against LOADED_DTYPES in one assertion"""
+    actual = data.dtypes[LOADED_DTYPES.index].astype(str).str.replace(r'\[.*\]', '', regex=True)
+    pd.testing.assert_series_equal(actual, LOADED_DTYPES, check_names=False, check_dtype=False)
+
 
 class TestDataLoader:
     """Test data loading functionality"""
     
-    def setup_method(self):
-        """Setup test data"""
-        self.test_data = {
-            'ID': [1, 2, 3, 4, 5],
-            'Nombre': ['Juan Pérez', 'María García', 'Carlos López', 'Ana Martín', 'Luis Rodríguez'],
-            'Departamento': ['Marketing', 'Ventas', 'Marketing', 'RRHH', 'Ventas'],
-            'Fecha inicio vacaciones': ['2024-07-01', '2024-07-05', '2024-07-03', '2024-07-10', '2024-07-15'],
-            'Fecha fin vacaciones': ['2024-07-10', '2024-07-12', '2024-07-08', '2024-07-17', '2024-07-22'],
-            'Días': [10, 8, 6, 8, 8],
-            'Aprobado': ['Sí', 'Sí', 'No', 'Sí', 'Sí']
-        }
+    @pytest.mark.parametrize('data, check', [
+        (LOADER_DATA, 'ok'),
+        ({**LOADER_DATA, 'Días': ['invalid', 'data', '10', 'test', '5']}, 'nan'),
+        ({'ID': [1, 2], 'Nombre': ['Test 1', 'Test 2']}, 'raises'),
+    ], ids=['valid', 'invalid_data_types', 'missing_columns'])
+    def test_normalize(self, app_api, data, check):
+        """Test column renaming and dtype coercion: valid, non-numeric Días, missing columns"""
+        if check == 'raises':
+            with pytest.raises(KeyError):
+                app_api._normalize(pd.DataFrame(data))
+            return
+        
+        data = app_api._normalize(pd.DataFrame(data))
+        
+        if check == 'nan':
+            # Should handle invalid numeric data gracefully
+            assert data['Días'].isna().sum() > 0  # Some values should be NaN
+            return
+        
+        # Verify data types and structure
+        assert isinstance(data, pd.DataFrame)
+        assert len(data) == 5
+        _assert_loaded_dtypes(data)
+    
+    @pytest.mark.slow
+    def test_data_loader_with_file(self, app_api):
+        """Test data loading from an uploaded Excel file, end to end"""
+        data = app_api.data_loader(create_test_excel(LOADER_DATA))
+        
+        assert len(data) == 5
+        _assert_loaded_dtypes(data)
+        assert data.attrs['dept_options'] == ['Marketing', 'RRHH', 'Ventas']
+
+
+@pytest.fixture
+def default_data_files(app_api, tmp_path, monkeypatch):
+    """
+    Point the bundled-dataset paths at a workbook in tmp_path and count the
+    Excel parses _load_default_data performs (cache misses).
+    """
+    workbook = tmp_path / 'vacaciones.xlsx'
+    workbook.write_bytes(create_test_excel(LOADER_DATA).getvalue())
+    monkeypatch.setattr(app_api, 'DEFAULT_DATA_PATH', str(workbook))
+    monkeypatch.setattr(app_api, 'DEFAULT_DATA_CACHE_PATH', str(tmp_path / 'vacaciones.parquet'))
     
-    def create_test_excel(self, data=None):
-        """Create a temporary Excel file for testing"""
-        if data is None:
-            data = self.test_data
-        
-        df = pd.DataFrame(data)
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
-        df.to_excel(temp_file.name, index=False)
-        return temp_file.name
+    parses = []
+    read_excel = app_api._read_excel
+    def counting_read_excel(source):
+        parses.append(source)
+        return read_excel(source)
+    monkeypatch.setattr(app_api, '_read_excel', counting_read_excel)
+    return workbook, tmp_path / 'vacaciones.parquet', parses
+
+
+class TestDefaultDataCache:
+    """Test the Parquet copy of the bundled dataset"""
     
-    def test_data_loader_with_file(self):
-        """Test data loading from uploaded file"""
-        temp_file = self.create_test_excel()
-        
-        try:
-            # Mock uploaded file
-            with open(temp_file, 'rb') as f:
-                data = data_loader(f)
-            
-            # Verify data types and structure
-            assert isinstance(data, pd.DataFrame)
-            assert len(data) == 5
-            assert 'Fecha inicio' in data.columns
-            assert 'Fecha fin' in data.columns
-            assert pd.api.types.is_datetime64_any_dtype(data['Fecha inicio'])
-            assert pd.api.types.is_datetime64_any_dtype(data['Fecha fin'])
-            assert data['Departamento'].dtype.name == 'category'
-            assert data['Aprobado'].dtype.name == 'category'
-            
-        finally:
-            os.unlink(temp_file)
+    def test_cache_hit(self, app_api, default_data_files):
+        """Test that a second load reads the Parquet copy instead of the workbook"""
+        _, cache_path, parses = default_data_files
+        first = app_api._load_default_data()
+        second = app_api._load_default_data()
+        
+        assert cache_path.exists()
+        assert len(parses) == 1
+        pd.testing.assert_frame_equal(second, first)
     
-    def test_data_loader_invalid_data_types(self):
-        """Test data loader with invalid data types"""
-        invalid_data = self.test_data.copy()
-        invalid_data['Días'] = ['invalid', 'data', '10', 'test', '5']
+    def test_stale_mtime_reparses(self, app_api, default_data_files):
+        """Test that a workbook modified after the copy was written is parsed again"""
+        workbook, _, parses = default_data_files
+        app_api._load_default_data()
+        stat = workbook.stat()
+        os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        data = app_api._load_default_data()
         
-        temp_file = self.create_test_excel(invalid_data)
+        assert len(parses) == 2
+        assert data.attrs['source_mtime_ns'] == workbook.stat().st_mtime_ns
+    
+    def test_cache_version_mismatch_reparses(self, app_api, default_data_files, monkeypatch):
+        """Test that a copy written by another _normalize version is ignored"""
+        _, _, parses = default_data_files
+        app_api._load_default_data()
+        monkeypatch.setattr(app_api, 'DEFAULT_DATA_CACHE_VERSION', app_api.DEFAULT_DATA_CACHE_VERSION + 1)
+        data = app_api._load_default_data()
         
-        try:
-            with open(temp_file, 'rb') as f:
-                data = data_loader(f)
-            
-            # Should handle invalid numeric data gracefully
-            assert data['Días'].isna().sum() > 0  # Some values should be NaN
-            
-        finally:
-            os.unlink(temp_file)
+        assert len(parses) == 2
+        assert data.attrs['cache_version'] == app_api.DEFAULT_DATA_CACHE_VERSION
     
-    def test_data_loader_missing_columns(self):
-        """Test data loader with missing required columns"""
-        incomplete_data = {
-            'ID': [1, 2],
-            'Nombre': ['Test 1', 'Test 2']
-            # Missing required columns
-        }
+    def test_failed_write_still_returns_data(self, app_api, default_data_files, monkeypatch):
+        """Test that a frame pyarrow rejects is loaded anyway, just not cached"""
+        _, cache_path, _ = default_data_files
+        def reject(self, *args, **kwargs):
+            raise ValueError("mixed-type column")  # as pyarrow's ArrowInvalid
+        monkeypatch.setattr(pd.DataFrame, 'to_parquet', reject)
+        data = app_api._load_default_data()
         
-        temp_file = self.create_test_excel(incomplete_data)
+        assert len(data) == 5
+        assert not cache_path.exists()
+
+    def test_failed_write_removes_partial_file(self, app_api, default_data_files, monkeypatch):
+        """Test that a write interrupted partway leaves no temporary file behind"""
+        workbook, cache_path, _ = default_data_files
+        def interrupted(self, path, *args, **kwargs):
+            with open(path, 'wb') as f:
+                f.write(b'PAR1')
+            raise OSError("No space left on device")
+        monkeypatch.setattr(pd.DataFrame, 'to_parquet', interrupted)
+        data = app_api._load_default_data()
         
-        try:
-            with open(temp_file, 'rb') as f:
-                with pytest.raises(KeyError):
-                    data_loader(f)
-        finally:
-            os.unlink(temp_file)
+        assert len(data) == 5
+        assert sorted(p.name for p in cache_path.parent.iterdir()) == [workbook.name]
 
 
 class TestConflictDetection:
     """Test conflict detection functionality - Requirement 3"""
     
-    def setup_method(self):
-        """Setup test data with known conflicts"""
-        self.conflict_data = pd.DataFrame({
-            'Nombre': ['Employee A', 'Employee B', 'Employee C', 'Employee D'],
-            'Departamento': pd.Categorical(['Marketing', 'Marketing', 'Ventas', 'Marketing']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-05', '2024-07-01', '2024-07-03']),
-            'Fecha fin': pd.to_datetime(['2024-07-10', '2024-07-12', '2024-07-08', '2024-07-06']),
-            'Aprobado': pd.Categorical(['Sí', 'Sí', 'Sí', 'Sí'])
-        })
-    
-    def test_conflicts_detector_with_conflicts(self):
+    def test_conflicts_detector_with_conflicts(self, app_api):
         """Test conflict detection when conflicts exist"""
-        conflicts = conflicts_detector(self.conflict_data)
+        conflicts = app_api.conflicts_detector(FROZEN_CONFLICT_DATA)
         
         # Should detect conflicts in Marketing department
         assert len(conflicts) > 0
         
         # Check that conflicting employees are identified
-        conflict_names = [c['Nombre'] for c in conflicts]
-        assert 'Employee A' in conflict_names or 'Employee B' in conflict_names
+        conflict_names = {c['Nombre'] for c in conflicts}
+        assert conflict_names & {'Employee A', 'Employee B'}
     
-    def test_conflicts_detector_no_conflicts(self):
+    def test_conflicts_detector_no_conflicts(self, app_api):
         """Test conflict detection with no overlapping dates"""
         no_conflict_data = pd.DataFrame({
             'Nombre': ['Employee A', 'Employee B'],
-            'Departamento': pd.Categorical(['Marketing', 'Marketing']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-15']),
-            'Fecha fin': pd.to_datetime(['2024-07-10', '2024-07-20']),
-            'Aprobado': pd.Categorical(['Sí', 'Sí'])
+            'Departamento': pd.array(['Marketing', 'Marketing'], dtype=DEPT_DTYPE),
+            'Fecha inicio': np.array(['2024-07-01', '2024-07-15'], dtype='datetime64[ns]'),
+            'Fecha fin': np.array(['2024-07-10', '2024-07-20'], dtype='datetime64[ns]'),
+            'Aprobado': pd.array(['Sí', 'Sí'], dtype=APPROVAL_DTYPE)
         })
         
-        conflicts = conflicts_detector(no_conflict_data)
+        conflicts = app_api.conflicts_detector(no_conflict_data)
         assert len(conflicts) == 0
     
-    def test_conflicts_detector_different_departments(self):
+    def test_conflicts_detector_different_departments(self, app_api):
         """Test that conflicts are only detected within same department"""
         different_dept_data = pd.DataFrame({
             'Nombre': ['Employee A', 'Employee B'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-01']),
-            'Fecha fin': pd.to_datetime(['2024-07-10', '2024-07-10']),
-            'Aprobado': pd.Categorical(['Sí', 'Sí'])
+            'Departamento': pd.array(['Marketing', 'Ventas'], dtype=DEPT_DTYPE),
+            'Fecha inicio': np.array(['2024-07-01', '2024-07-01'], dtype='datetime64[ns]'),
+            'Fecha fin': np.array(['2024-07-10', '2024-07-10'], dtype='datetime64[ns]'),
+            'Aprobado': pd.array(['Sí', 'Sí'], dtype=APPROVAL_DTYPE)
         })
         
-        conflicts = conflicts_detector(different_dept_data)
+        conflicts = app_api.conflicts_detector(different_dept_data)
         assert len(conflicts) == 0
     
-    def test_conflicts_detector_unapproved_vacations(self):
+    def test_conflicts_detector_unapproved_vacations(self, app_api):
         """Test that only approved vacations are considered for conflicts"""
         unapproved_data = pd.DataFrame({
             'Nombre': ['Employee A', 'Employee B'],
-            'Departamento': pd.Categorical(['Marketing', 'Marketing']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-01']),
-            'Fecha fin': pd.to_datetime(['2024-07-10', '2024-07-10']),
-            'Aprobado': pd.Categorical(['No', 'No'])
+            'Departamento': pd.array(['Marketing', 'Marketing'], dtype=DEPT_DTYPE),
+            'Fecha inicio': np.array(['2024-07-01', '2024-07-01'], dtype='datetime64[ns]'),
+            'Fecha fin': np.array(['2024-07-10', '2024-07-10'], dtype='datetime64[ns]'),
+            'Aprobado': pd.array(['No', 'No'], dtype=APPROVAL_DTYPE)
         })
         
-        conflicts = conflicts_detector(unapproved_data)
+        conflicts = app_api.conflicts_detector(unapproved_data)
         assert len(conflicts) == 0
 
+    @pytest.mark.parametrize('index', [None, [60, 10, 50, 20, 40, 30]], ids=['range_index', 'label_index'])
+    @pytest.mark.parametrize('departments, approval_status, date_range', [
+        (['Marketing', 'Ventas'], ['Sí', 'No'], []),
+        (['Marketing'], ['Sí', 'No'], []),
+        (['Marketing', 'Ventas'], ['No'], []),
+        # Keeps Employee A and D but drops B, which overlaps A
+        (['Marketing', 'Ventas'], ['Sí'], [datetime(2024, 7, 1), datetime(2024, 7, 10)]),
+        # Keeps only Employee D of the A-D pair
+        (['Marketing', 'Ventas'], ['Sí'], [datetime(2024, 7, 2), datetime(2024, 7, 7)]),
+        (['RRHH'], ['Sí', 'No'], []),
+    ], ids=['all', 'department', 'unapproved', 'date_range', 'date_range_one_side', 'empty'])
+    def test_visible_conflicts_match_detector(self, app_api, index, departments, approval_status, date_range):
+        """Test that conflicts taken from the full dataset's graph equal detecting on the filtered rows"""
+        data = FROZEN_VISIBLE_CONFLICT_DATA
+        if index is not None:
+            data = data.set_axis(index)
+        filtered = app_api.get_filtered_data(data, departments, approval_status, date_range)
+        
+        assert app_api.visible_conflicts(data, filtered) == app_api.conflicts_detector(filtered)
+
 
 class TestFiltering:
     """Test filtering functionality - Requirement 2"""
     
-    def setup_method(self):
-        """Setup test data for filtering"""
-        self.filter_data = pd.DataFrame({
-            'Nombre': ['Emp1', 'Emp2', 'Emp3', 'Emp4'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas', 'Marketing', 'RRHH']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-05', '2024-07-10', '2024-07-15']),
-            'Fecha fin': pd.to_datetime(['2024-07-08', '2024-07-12', '2024-07-17', '2024-07-22']),
-            'Aprobado': pd.Categorical(['Sí', 'No', 'Sí', 'Sí'])
-        })
-    
-    def test_filter_by_department(self):
+    def test_filter_by_department(self, app_api):
         """Test filtering by department"""
-        filtered = get_filtered_data(
-            self.filter_data, 
+        filtered = app_api.get_filtered_data(
+            FROZEN_FILTER_DATA, 
             departments=['Marketing'], 
             approval_status=['Sí', 'No'],
             date_range=[]
         )
         
         assert len(filtered) == 2
-        assert all(filtered['Departamento'] == 'Marketing')
+        assert _cat_all_equal(filtered['Departamento'], 'Marketing')
     
-    def test_filter_by_approval_status(self):
+    def test_filter_by_approval_status(self, app_api):
         """Test filtering by approval status"""
-        filtered = get_filtered_data(
-            self.filter_data,
+        filtered = app_api.get_filtered_data(
+            FROZEN_FILTER_DATA,
             departments=['Marketing', 'Ventas', 'RRHH'],
             approval_status=['Sí'],
             date_range=[]
         )
         
         assert len(filtered) == 3
-        assert all(filtered['Aprobado'] == 'Sí')
+        assert _cat_all_equal(filtered['Aprobado'], 'Sí')
     
-    def test_combined_filters(self):
+    def test_combined_filters(self, app_api):
         """Test multiple filters applied together"""
-        filtered = get_filtered_data(
-            self.filter_data,
+        filtered = app_api.get_filtered_data(
+            FROZEN_FILTER_DATA,
             departments=['Marketing'],
             approval_status=['Sí'],
             date_range=[datetime(2024, 7, 1), datetime(2024, 7, 15)]
@@ -209,51 +372,60 @@ class TestFiltering:
         assert len(filtered) == 1
         assert filtered.iloc[0]['Nombre'] == 'Emp1'
 
+    def test_active_categories_categorical(self, app_api):
+        """Test that unused and missing categories are dropped, keeping category order"""
+        departments = pd.Series(pd.array(['Ventas', pd.NA, 'Marketing', 'Ventas'], dtype=DEPT_DTYPE))
+        
+        assert app_api.active_categories(departments).tolist() == ['Marketing', 'Ventas']
+        assert app_api.active_categories(departments.iloc[:0]).tolist() == []
+    
+    def test_active_categories_object(self, app_api):
+        """Test the fallback for non-categorical columns: distinct non-null values in order of appearance"""
+        departments = pd.Series(['Ventas', None, 'Marketing', 'Ventas'], dtype=object)
+        
+        assert app_api.active_categories(departments).tolist() == ['Ventas', 'Marketing']
+
 
 class TestStatistics:
     """Test statistics calculations - Requirement 4"""
     
-    def setup_method(self):
-        """Setup test data for statistics"""
-        self.stats_data = pd.DataFrame({
-            'Nombre': ['Emp1', 'Emp2', 'Emp3', 'Emp4'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas', 'Marketing', 'RRHH']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-05', '2024-07-10', '2024-07-15']),
-            'Fecha fin': pd.to_datetime(['2024-07-10', '2024-07-12', '2024-07-17', '2024-07-22']),
-            'Días': [10, 8, 8, 8],
-            'Aprobado': pd.Categorical(['Sí', 'Sí', 'No', 'Sí'])
-        })
-    
-    def test_calculate_summary_metrics(self):
+    def test_calculate_summary_metrics(self, app_api):
         """Test summary metrics calculation"""
-        total_emp, avg_days, approved_pct = calculate_summary_metrics(self.stats_data)
+        total_emp, avg_days, approved_pct = app_api.calculate_summary_metrics(FROZEN_STATS_DATA)
         
         assert total_emp == 4
         assert avg_days == 8.5  # (10 + 8 + 8 + 8) / 4
         assert approved_pct == 75.0  # 3 out of 4 approved
     
-    def test_calculate_summary_metrics_empty_data(self):
+    def test_calculate_summary_metrics_empty_data(self, app_api):
         """Test summary metrics with empty data"""
         empty_data = pd.DataFrame()
-        total_emp, avg_days, approved_pct = calculate_summary_metrics(empty_data)
+        total_emp, avg_days, approved_pct = app_api.calculate_summary_metrics(empty_data)
         
         assert total_emp == 0
         assert avg_days == 0.0
         assert approved_pct == 0.0
     
-    def test_employees_vacations_per_week(self):
+    def test_employees_vacations_per_week(self, app_api):
         """Test weekly vacation statistics"""
-        weekly_stats = employees_vacations_per_week(self.stats_data)
+        weekly_stats = app_api.employees_vacations_per_week(FROZEN_STATS_DATA)
         
         assert isinstance(weekly_stats, pd.DataFrame)
         assert 'empleados_vacaciones' in weekly_stats.columns
         assert 'week_start' in weekly_stats.columns
         assert len(weekly_stats) > 0
     
-    def test_department_percentages(self):
+    def test_week_vacation_details(self, app_api):
+        """Test employees listed for a single week"""
+        details = app_api.week_vacation_details(FROZEN_STATS_DATA, pd.Timestamp('2024-07-08'))
+        
+        assert list(details.columns) == ['Nombre', 'Departamento']
+        assert set(details['Nombre']) == {'Emp1', 'Emp2', 'Emp3'}
+    
+    def test_department_percentages(self, app_api):
         """Test department percentage calculations"""
-        current_vacations = self.stats_data[self.stats_data['Aprobado'] == 'Sí']
-        dept_stats = department_percentages(self.stats_data, current_vacations)
+        current_vacations = FROZEN_STATS_DATA[FROZEN_STATS_DATA['Aprobado'] == 'Sí']
+        dept_stats = app_api.department_percentages(FROZEN_STATS_DATA, current_vacations)
         
         assert isinstance(dept_stats, pd.DataFrame)
         assert 'porcentaje_vacaciones' in dept_stats.columns
@@ -261,51 +433,39 @@ class TestStatistics:
         assert 'empleados_vacaciones' in dept_stats.columns
 
 
+@pytest.fixture(scope="module")
+def current_vacation_data(today):
+    """Current, future and past vacations around the pinned today"""
+    return pd.DataFrame({
+        'Nombre': ['Current1', 'Current2', 'Future1', 'Past1'],
+        'Departamento': pd.array(['Marketing', 'Ventas', 'Marketing', 'RRHH'], dtype=DEPT_DTYPE),
+        'Fecha inicio': today.to_numpy() + np.array([-2, -1, 5, -10], dtype='timedelta64[D]'),
+        'Fecha fin': today.to_numpy() + np.array([3, 2, 10, -5], dtype='timedelta64[D]'),
+        'Aprobado': pd.array(['Sí', 'Sí', 'Sí', 'Sí'], dtype=APPROVAL_DTYPE)
+    })
+
+
 class TestCurrentVacations:
     """Test current vacations functionality - Requirement 7"""
     
-    def setup_method(self):
-        """Setup test data with current and future vacations"""
-        today = pd.Timestamp.now()
-        self.current_vacation_data = pd.DataFrame({
-            'Nombre': ['Current1', 'Current2', 'Future1', 'Past1'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas', 'Marketing', 'RRHH']),
-            'Fecha inicio': [
-                today - timedelta(days=2),
-                today - timedelta(days=1),
-                today + timedelta(days=5),
-                today - timedelta(days=10)
-            ],
-            'Fecha fin': [
-                today + timedelta(days=3),
-                today + timedelta(days=2),
-                today + timedelta(days=10),
-                today - timedelta(days=5)
-            ],
-            'Aprobado': pd.Categorical(['Sí', 'Sí', 'Sí', 'Sí'])
-        })
-    
-    def test_get_current_vacations(self):
+    def test_get_current_vacations(self, app_api, current_vacation_data, today):
         """Test identification of current vacations"""
-        today = pd.Timestamp.now()
-        current = get_current_vacations(self.current_vacation_data, today)
+        current = app_api.get_current_vacations(current_vacation_data, today)
         
         # Should only include employees currently on vacation
         assert len(current) == 2
-        current_names = current['Nombre'].tolist()
-        assert 'Current1' in current_names
-        assert 'Current2' in current_names
-        assert 'Future1' not in current_names
-        assert 'Past1' not in current_names
+        current_names = set(current['Nombre'])
+        assert current_names.issuperset({'Current1', 'Current2'})
+        assert current_names.isdisjoint({'Future1', 'Past1'})
     
-    def test_get_current_vacations_specific_date(self):
+    def test_get_current_vacations_specific_date(self, app_api):
         """Test current vacations for a specific date"""
         test_date = pd.Timestamp('2024-07-01')
         
         # Create data relative to test date
         test_data = pd.DataFrame({
             'Nombre': ['Test1', 'Test2'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas']),
+            'Departamento': pd.array(['Marketing', 'Ventas'], dtype=DEPT_DTYPE),
             'Fecha inicio': [
                 test_date - timedelta(days=2),
                 test_date + timedelta(days=1)
@@ -314,10 +474,10 @@ class TestCurrentVacations:
                 test_date + timedelta(days=2),
                 test_date + timedelta(days=5)
             ],
-            'Aprobado': pd.Categorical(['Sí', 'Sí'])
+            'Aprobado': pd.array(['Sí', 'Sí'], dtype=APPROVAL_DTYPE)
         })
         
-        current = get_current_vacations(test_data, test_date)
+        current = app_api.get_current_vacations(test_data, test_date)
         assert len(current) == 1
         assert current.iloc[0]['Nombre'] == 'Test1'
 
@@ -325,21 +485,10 @@ class TestCurrentVacations:
 class TestTableFormatting:
     """Test table formatting and visualization - Requirement 1"""
     
-    def setup_method(self):
-        """Setup test data for table formatting"""
-        self.table_data = pd.DataFrame({
-            'Nombre': ['Employee1', 'Employee2'],
-            'Departamento': pd.Categorical(['Marketing', 'Ventas']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-05']),
-            'Fecha fin': pd.to_datetime(['2024-07-10', '2024-07-12']),
-            'Días': [10, 8],
-            'Aprobado': pd.Categorical(['Sí', 'Sí'])
-        })
-    
-    def test_table_formatter(self):
+    def test_table_formatter(self, app_api):
         """Test table formatting functionality"""
-        conflicts = conflicts_detector(self.table_data)
-        formatted_table = table_formatter(self.table_data, conflicts)
+        conflicts = app_api.conflicts_detector(FROZEN_TABLE_DATA)
+        formatted_table = app_api.table_formatter(FROZEN_TABLE_DATA, conflicts)
         
         assert isinstance(formatted_table, pd.DataFrame)
         assert 'Empleado' in formatted_table.columns
@@ -348,11 +497,11 @@ class TestTableFormatting:
         assert 'Fin de Vacaciones' in formatted_table.columns
         assert '⚠️' in formatted_table.columns
     
-    def test_table_formatter_empty_data(self):
+    def test_table_formatter_empty_data(self, app_api):
         """Test table formatting with empty data"""
         empty_data = pd.DataFrame()
         conflicts = []
-        formatted_table = table_formatter(empty_data, conflicts)
+        formatted_table = app_api.table_formatter(empty_data, conflicts)
         
         assert isinstance(formatted_table, pd.DataFrame)
         assert len(formatted_table) == 0
@@ -361,21 +510,10 @@ class TestTableFormatting:
 class TestDashboardRequirements:
     """Test dashboard functionality - Requirement 6"""
     
-    def setup_method(self):
-        """Setup test data for dashboard testing"""
-        self.dashboard_data = pd.DataFrame({
-            'Nombre': [f'Emp{i}' for i in range(1, 11)],
-            'Departamento': pd.Categorical(['Marketing'] * 4 + ['Ventas'] * 3 + ['RRHH'] * 3),
-            'Fecha inicio': pd.to_datetime(['2024-07-01'] * 10),
-            'Fecha fin': pd.to_datetime(['2024-07-10'] * 10),
-            'Días': [8] * 10,
-            'Aprobado': pd.Categorical(['Sí'] * 8 + ['No'] * 2)
-        })
-    
-    def test_department_dashboard_calculations(self):
+    def test_department_dashboard_calculations(self, app_api):
         """Test department-wise percentage calculations"""
-        current_vacations = self.dashboard_data[self.dashboard_data['Aprobado'] == 'Sí']
-        dept_stats = department_percentages(self.dashboard_data, current_vacations)
+        current_vacations = FROZEN_DASHBOARD_DATA[FROZEN_DASHBOARD_DATA['Aprobado'] == 'Sí']
+        dept_stats = app_api.department_percentages(FROZEN_DASHBOARD_DATA, current_vacations)
         
         # Verify department statistics
         marketing_stats = dept_stats[dept_stats['Departamento'] == 'Marketing']
@@ -388,34 +526,34 @@ class TestDashboardRequirements:
 class TestErrorHandling:
     """Test error handling and edge cases"""
     
-    def test_invalid_date_handling(self):
+    def test_invalid_date_handling(self, app_api):
         """Test handling of invalid dates"""
         invalid_data = pd.DataFrame({
             'Nombre': ['Test'],
-            'Departamento': pd.Categorical(['Marketing']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01']),
-            'Fecha fin': pd.to_datetime(['2024-06-01']),  # End before start
+            'Departamento': pd.array(['Marketing'], dtype=DEPT_DTYPE),
+            'Fecha inicio': np.array(['2024-07-01'], dtype='datetime64[ns]'),
+            'Fecha fin': np.array(['2024-06-01'], dtype='datetime64[ns]'),  # End before start
             'Días': [10],
-            'Aprobado': pd.Categorical(['Sí'])
+            'Aprobado': pd.array(['Sí'], dtype=APPROVAL_DTYPE)
         })
         
         # Functions should handle invalid date ranges gracefully
-        conflicts = conflicts_detector(invalid_data)
+        conflicts = app_api.conflicts_detector(invalid_data)
         assert isinstance(conflicts, list)
     
-    def test_missing_values_handling(self):
+    def test_missing_values_handling(self, app_api):
         """Test handling of missing values in data"""
         data_with_nulls = pd.DataFrame({
-            'Nombre': ['Emp1', 'Emp2', None],
-            'Departamento': pd.Categorical(['Marketing', None, 'Ventas']),
-            'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-05', None]),
-            'Fecha fin': pd.to_datetime(['2024-07-10', None, '2024-07-15']),
-            'Días': [10, None, 8],
-            'Aprobado': pd.Categorical(['Sí', 'Sí', None])
+            'Nombre': pd.array(['Emp1', 'Emp2', pd.NA], dtype='string'),
+            'Departamento': pd.array(['Marketing', pd.NA, 'Ventas'], dtype=DEPT_DTYPE),
+            'Fecha inicio': np.array(['2024-07-01', '2024-07-05', 'NaT'], dtype='datetime64[ns]'),
+            'Fecha fin': np.array(['2024-07-10', 'NaT', '2024-07-15'], dtype='datetime64[ns]'),
+            'Días': pd.array([10, pd.NA, 8], dtype='Int64'),
+            'Aprobado': pd.array(['Sí', 'Sí', pd.NA], dtype=APPROVAL_DTYPE)
         })
         
         # Functions should handle missing values without crashing
-        total_emp, avg_days, approved_pct = calculate_summary_metrics(data_with_nulls)
+        total_emp, avg_days, approved_pct = app_api.calculate_summary_metrics(data_with_nulls)
         assert isinstance(total_emp, int)
         assert isinstance(avg_days, float)
         assert isinstance(approved_pct, float)
@@ -424,32 +562,31 @@ class TestErrorHandling:
 class TestIntegration:
     """Integration tests for complete workflows"""
     
-    def setup_method(self):
-        """Setup comprehensive test data"""
-        self.integration_data = pd.DataFrame({
-            'ID': range(1, 21),
-            'Nombre': [f'Employee_{i}' for i in range(1, 21)],
-            'Departamento': pd.Categorical(['Marketing'] * 8 + ['Ventas'] * 7 + ['RRHH'] * 5),
-            'Fecha inicio vacaciones': pd.date_range('2024-07-01', periods=20, freq='2D'),
-            'Fecha fin vacaciones': pd.date_range('2024-07-08', periods=20, freq='2D'),
-            'Días': np.random.randint(5, 15, 20),
-            'Aprobado': pd.Categorical(['Sí'] * 15 + ['No'] * 5)
-        })
-    
-
-# Pytest configuration and fixtures
-@pytest.fixture
-def sample_vacation_data():
-    """Fixture providing sample vacation data"""
-    return pd.DataFrame({
-        'Nombre': ['Test Employee 1', 'Test Employee 2', 'Test Employee 3'],
-        'Departamento': pd.Categorical(['Marketing', 'Ventas', 'Marketing']),
-        'Fecha inicio': pd.to_datetime(['2024-07-01', '2024-07-05', '2024-07-10']),
-        'Fecha fin': pd.to_datetime(['2024-07-08', '2024-07-12', '2024-07-17']),
-        'Días': [8, 8, 8],
-        'Aprobado': pd.Categorical(['Sí', 'Sí', 'No'])
-    })
-
+    def test_load_filter_detect_and_count(self, app_api):
+        """Test the loader -> filter -> conflicts -> weekly statistics pipeline"""
+        data = app_api._normalize(FROZEN_INTEGRATION_DATA.copy())
+        filtered = app_api.get_filtered_data(
+            data,
+            departments=['Marketing', 'Ventas'],
+            approval_status=['Sí'],
+            date_range=[]
+        )
+        
+        # RRHH's five requests are the unapproved ones
+        assert len(filtered) == 15
+        
+        # 8-day vacations starting every 2 days overlap their neighbours, so
+        # every approved employee conflicts, and only within their department
+        conflicts = app_api.conflicts_detector(filtered)
+        assert {c['Nombre'] for c in conflicts} == {f'Employee_{i}' for i in range(1, 16)}
+        departments = dict(zip(filtered['Nombre'], filtered['Departamento']))
+        for c in conflicts:
+            for other in c['conflictos']:
+                assert departments[other['conflicting_employee']] == c['Departamento']
+        
+        weekly_stats = app_api.employees_vacations_per_week(filtered)
+        assert weekly_stats['week_start'].iloc[0] == pd.Timestamp('2024-07-01')
+        assert weekly_stats['empleados_vacaciones'].tolist() == [4, 7, 7, 7, 4, 1]
 
 if __name__ == "__main__":
     # Run tests with pytest